@@ -1,14 +1,150 @@
 # Algoritmos disponíveis
+import inspect
+from typing import Callable, Optional
+
 from .uninformed.dfs import dfs
 from .uninformed.bfs import bfs
 from .uninformed.uniform_cost import uniform_cost_search
 from .informed.a_star import a_star
 from .informed.greedy import greedy_bfs
+from .informed.bidirectional import bidirectional_a_star, bidirectional_dijkstra
+from .hierarchical.contraction_hierarchies import contraction_hierarchies
+from .uninformed.one_to_many import one_to_many, many_to_one, ShortestPathTree
+from .utils.distance_matrix import distance_matrix, DistanceMatrix
+from .informed.heuristics import EVENT_HEURISTICS
+
+
+# =============================================================================
+# PROTOCOLO DOS ALGORITMOS DE PROCURA
+# =============================================================================
+
+class SearchAlgorithm:
+    """
+    Algoritmo de procura ponto-a-ponto e os parâmetros opcionais que aceita.
+
+    Todos os algoritmos recebem (start, goal, graph) e devolvem
+    (distância em metros, tempo em minutos, caminho). As capacidades são
+    declaradas uma vez no registo, para que quem os chama não tenha de
+    inspecionar a assinatura em cada procura.
+
+    Attributes:
+        name: Nome do algoritmo (chave em ALGORITHMS)
+        func: Função de procura
+        informed: Aceita 'criterion' (heurística)
+        uses_vehicle_type: Aceita 'vehicle_type'
+        uses_events: Aceita 'event_manager' e 'current_time'
+    """
+
+    def __init__(self, name: str, func: Callable, informed: bool = False,
+                 uses_vehicle_type: bool = False, uses_events: bool = False) -> None:
+        self.name = name
+        self.func = func
+        self.informed = informed
+        self.uses_vehicle_type = uses_vehicle_type
+        self.uses_events = uses_events
+
+    @classmethod
+    def from_function(cls, func: Callable) -> 'SearchAlgorithm':
+        """Descreve uma função não registada a partir da sua assinatura (uma só vez)."""
+        params = inspect.signature(func).parameters
+        return cls(getattr(func, '__name__', repr(func)), func,
+                   informed='criterion' in params,
+                   uses_vehicle_type='vehicle_type' in params,
+                   uses_events='event_manager' in params and 'current_time' in params)
+
+    def bind(self, heuristic: Optional[str] = None, event_manager=None) -> 'BoundSearch':
+        """
+        Fixa a heurística e o gestor de eventos de uma simulação.
+
+        Args:
+            heuristic: Critério da heurística (ignorado em algoritmos não informados)
+            event_manager: Gestor de eventos (só usado por algoritmos informados)
+
+        Returns:
+            BoundSearch
+        """
+        return BoundSearch(self, heuristic, event_manager)
 
-ALGORITHMS = {
-    'dfs': dfs,
-    'bfs': bfs,
-    'uniform_cost': uniform_cost_search,
-    'a_star': a_star,
-    'greedy': greedy_bfs,
+
+class BoundSearch:
+    """
+    Algoritmo pronto a chamar com search(start, goal, graph, vehicle_type, current_time).
+
+    Os argumentos passados ao algoritmo são escolhidos uma vez, na criação:
+    com heurística, os algoritmos informados recebem criterion, vehicle_type,
+    event_manager e current_time (os que aceitarem); sem heurística, ou em
+    algoritmos não informados, só vehicle_type.
+
+    Attributes:
+        algorithm: SearchAlgorithm associado
+        criterion: Heurística usada (None se não é passada ao algoritmo)
+        uses_vehicle_type: O tipo de veículo é passado ao algoritmo
+        time_dependent: O resultado depende do instante (heurística com clima/trânsito)
+    """
+
+    def __init__(self, algorithm: SearchAlgorithm, heuristic: Optional[str] = None,
+                 event_manager=None) -> None:
+        self.algorithm = algorithm
+        self.criterion = heuristic if algorithm.informed and heuristic else None
+        self.uses_vehicle_type = algorithm.uses_vehicle_type
+        self.time_dependent = (self.criterion in EVENT_HEURISTICS and algorithm.uses_events
+                               and event_manager is not None)
+
+        func = algorithm.func
+        criterion = self.criterion
+        if criterion is not None and algorithm.uses_events:
+            if algorithm.uses_vehicle_type:
+                self._call = lambda start, goal, graph, vehicle_type, current_time: func(
+                    start, goal, graph, criterion=criterion, event_manager=event_manager,
+                    current_time=current_time, vehicle_type=vehicle_type)
+            else:
+                self._call = lambda start, goal, graph, vehicle_type, current_time: func(
+                    start, goal, graph, criterion=criterion, event_manager=event_manager,
+                    current_time=current_time)
+        elif criterion is not None:
+            if algorithm.uses_vehicle_type:
+                self._call = lambda start, goal, graph, vehicle_type, current_time: func(
+                    start, goal, graph, criterion=criterion, vehicle_type=vehicle_type)
+            else:
+                self._call = lambda start, goal, graph, vehicle_type, current_time: func(
+                    start, goal, graph, criterion=criterion)
+        elif algorithm.uses_vehicle_type:
+            self._call = lambda start, goal, graph, vehicle_type, current_time: func(
+                start, goal, graph, vehicle_type=vehicle_type)
+        else:
+            self._call = lambda start, goal, graph, vehicle_type, current_time: func(start, goal, graph)
+
+    def __call__(self, start, goal, graph, vehicle_type=None, current_time=None):
+        return self._call(start, goal, graph, vehicle_type, current_time)
+
+
+ALGORITHM_SPECS = {
+    spec.name: spec for spec in (
+        SearchAlgorithm('dfs', dfs),
+        SearchAlgorithm('bfs', bfs),
+        SearchAlgorithm('uniform_cost', uniform_cost_search, uses_vehicle_type=True),
+        SearchAlgorithm('a_star', a_star, informed=True, uses_vehicle_type=True, uses_events=True),
+        SearchAlgorithm('greedy', greedy_bfs, informed=True, uses_vehicle_type=True, uses_events=True),
+        SearchAlgorithm('bidirectional_a_star', bidirectional_a_star,
+                        informed=True, uses_vehicle_type=True, uses_events=True),
+        SearchAlgorithm('bidirectional_dijkstra', bidirectional_dijkstra, uses_vehicle_type=True),
+        SearchAlgorithm('contraction_hierarchies', contraction_hierarchies, uses_vehicle_type=True),
+    )
 }
+
+ALGORITHMS = {name: spec.func for name, spec in ALGORITHM_SPECS.items()}
+
+
+def get_algorithm_spec(algorithm) -> SearchAlgorithm:
+    """
+    Retorna a descrição de um algoritmo a partir do nome, da função ou da
+    própria descrição. Funções não registadas são descritas pela assinatura.
+    """
+    if isinstance(algorithm, SearchAlgorithm):
+        return algorithm
+    if isinstance(algorithm, str):
+        return ALGORITHM_SPECS[algorithm]
+    for spec in ALGORITHM_SPECS.values():
+        if spec.func is algorithm:
+            return spec
+    return SearchAlgorithm.from_function(algorithm)
@@ -0,0 +1,345 @@
+"""
+Contraction Hierarchies personalizáveis (CCH) para consultas repetidas.
+
+O pré-processamento divide-se em duas fases:
+
+1. Fase independente dos pesos (uma vez por grafo): os nós são ordenados por
+   grau mínimo e contraídos por essa ordem. Contrair um nó liga entre si todos
+   os vizinhos ainda não contraídos (atalhos). O resultado é um conjunto de
+   arcos {u, w}, cada um entre um nó e outro de ordem superior, que não
+   depende de tempos, custos nem de estradas fechadas.
+
+2. Personalização (por perfil de custo e por epoch do grafo): cada arco recebe
+   o custo unificado (calculate_edge_cost) nos dois sentidos a partir das
+   arestas abertas e depois, por ordem crescente dos nós, cada triângulo
+   inferior x-v-w melhora o arco {v, w} com o caminho v -> x -> w. Quando o
+   EventManager aplica clima/trânsito ou fecha estradas o grafo muda de epoch
+   e basta repetir esta fase, sem voltar a contrair.
+
+A consulta é um Dijkstra bidirecional que só sobe na hierarquia; o caminho
+encontrado é depois expandido recursivamente pelos nós intermédios dos atalhos.
+"""
+from array import array
+from typing import Dict, List, Optional, Tuple
+import heapq
+
+from graph.graph import Graph
+from graph.position import Position
+from algorithms.informed.bidirectional import bidirectional_dijkstra
+from algorithms.utils.cost_function import calculate_edge_cost, cost_profile_key, has_static_edge_costs
+from vehicle.vehicle_types import VehicleType
+
+INF = float('inf')
+
+
+class CCHMetric:
+    """
+    Pesos personalizados dos arcos da hierarquia para um perfil e um epoch.
+
+    Attributes:
+        epoch: Epoch do grafo com que os pesos foram calculados
+        up_weight: Custo do arco no sentido do nó inferior para o superior
+        down_weight: Custo do arco no sentido do nó superior para o inferior
+        up_via / down_via: Nó intermédio do atalho em cada sentido (-1 se é uma aresta original)
+    """
+
+    def __init__(self, epoch: int, up_weight: array, down_weight: array, up_via: array, down_via: array) -> None:
+        self.epoch = epoch
+        self.up_weight = up_weight
+        self.down_weight = down_weight
+        self.up_via = up_via
+        self.down_via = down_via
+
+
+class ContractionHierarchy:
+    """
+    Estrutura da hierarquia (fase independente dos pesos) e pesos personalizados.
+
+    Attributes:
+        rank: Posição de cada nó na ordem de contração
+        arc_of: Dicionário (nó inferior, nó superior) -> índice do arco
+        up_arcs: Para cada nó, lista de (nó superior, índice do arco)
+        triangles: Triângulos inferiores achatados (arco v-w, arco x-v, arco x-w, x),
+                   por ordem crescente de x
+        max_edge_km: Comprimento da maior aresta (para saber quando um híbrido
+                     tem custos estáticos)
+    """
+
+    def __init__(self, graph: Graph) -> None:
+        n = len(graph.nodes)
+        adjacency = [set() for _ in range(n)]
+        max_distance = 0.0
+        for u, edges in graph.edges.items():
+            for edge in edges:
+                v = edge["target"]
+                max_distance = max(max_distance, edge["distance"])
+                if v != u:
+                    adjacency[u].add(v)
+                    adjacency[v].add(u)
+        self.max_edge_km = max_distance / 1000.0
+
+        # Ordem por grau mínimo (heap com entradas desatualizadas ignoradas)
+        rank = array('i', [-1]) * n
+        upper: List[List[int]] = [[] for _ in range(n)]
+        heap = [(len(adjacency[v]), v) for v in range(n)]
+        heapq.heapify(heap)
+        next_rank = 0
+        while heap:
+            degree, v = heapq.heappop(heap)
+            if rank[v] >= 0 or degree != len(adjacency[v]):
+                continue
+            rank[v] = next_rank
+            next_rank += 1
+            neighbors = list(adjacency[v])
+            upper[v] = neighbors
+            for a in neighbors:
+                adjacency[a].discard(v)
+            # Atalhos: os vizinhos restantes ficam todos ligados entre si
+            for i, a in enumerate(neighbors):
+                adjacency_a = adjacency[a]
+                for b in neighbors[i + 1:]:
+                    if b not in adjacency_a:
+                        adjacency_a.add(b)
+                        adjacency[b].add(a)
+            for a in neighbors:
+                heapq.heappush(heap, (len(adjacency[a]), a))
+            adjacency[v] = None
+
+        # Arcos da hierarquia, numerados por ordem de contração do nó inferior
+        order = sorted(range(n), key=rank.__getitem__)
+        arc_of: Dict[Tuple[int, int], int] = {}
+        up_arcs: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        for v in order:
+            upper[v].sort(key=rank.__getitem__)
+            for w in upper[v]:
+                arc = len(arc_of)
+                arc_of[(v, w)] = arc
+                up_arcs[v].append((w, arc))
+
+        triangles = array('i')
+        for x in order:
+            ups = up_arcs[x]
+            for i, (v, arc_xv) in enumerate(ups):
+                for w, arc_xw in ups[i + 1:]:
+                    triangles.extend((arc_of[(v, w)], arc_xv, arc_xw, x))
+
+        self.rank = rank
+        self.arc_of = arc_of
+        self.up_arcs = up_arcs
+        self.triangles = triangles
+        self.num_arcs = len(arc_of)
+        self._metrics: Dict[object, CCHMetric] = {}
+
+    # ========================================
+    # PERSONALIZAÇÃO
+    # ========================================
+
+    def has_static_costs(self, vehicle_type: Optional[VehicleType]) -> bool:
+        """
+        Indica se o custo das arestas depende apenas do perfil do veículo.
+
+        Os híbridos só têm custos estáticos quando a bateria atual chega para a
+        maior aresta (todas as arestas são feitas a bateria).
+        """
+        return has_static_edge_costs(vehicle_type, self.max_edge_km)
+
+    def metric(self, graph: Graph, vehicle_type: Optional[VehicleType]) -> Optional[CCHMetric]:
+        """
+        Retorna os pesos personalizados para o veículo no epoch atual do grafo,
+        repetindo a personalização se os eventos mudaram as arestas.
+
+        Returns:
+            CCHMetric, ou None se os custos do veículo não são estáticos
+        """
+        if not self.has_static_costs(vehicle_type):
+            return None
+        key = cost_profile_key(vehicle_type)
+        metric = self._metrics.get(key)
+        if metric is None or metric.epoch != graph.epoch:
+            metric = self.customize(graph, vehicle_type)
+            self._metrics[key] = metric
+        return metric
+
+    def customize(self, graph: Graph, vehicle_type: Optional[VehicleType]) -> CCHMetric:
+        """
+        Calcula os pesos dos arcos a partir dos tempos atuais e das estradas abertas.
+
+        Args:
+            graph: Grafo (o mesmo usado para construir a hierarquia)
+            vehicle_type: Tipo de veículo (define o custo das arestas)
+
+        Returns:
+            CCHMetric
+        """
+        m = self.num_arcs
+        up_weight = array('d', [INF]) * m
+        down_weight = array('d', [INF]) * m
+        up_via = array('i', [-1]) * m
+        down_via = array('i', [-1]) * m
+        rank = self.rank
+        arc_of = self.arc_of
+
+        # Arestas originais abertas (em paralelas fica a mais barata)
+        for u in range(len(rank)):
+            for v, distance, time in graph.neighbors(u):
+                if v == u:
+                    continue
+                cost = calculate_edge_cost(distance, time, vehicle_type)
+                if rank[u] < rank[v]:
+                    arc = arc_of[(u, v)]
+                    if cost < up_weight[arc]:
+                        up_weight[arc] = cost
+                else:
+                    arc = arc_of[(v, u)]
+                    if cost < down_weight[arc]:
+                        down_weight[arc] = cost
+
+        # Triângulos inferiores: v -> x -> w e w -> x -> v
+        triangles = self.triangles
+        for i in range(0, len(triangles), 4):
+            arc_vw = triangles[i]
+            arc_xv = triangles[i + 1]
+            arc_xw = triangles[i + 2]
+            cost = down_weight[arc_xv] + up_weight[arc_xw]
+            if cost < up_weight[arc_vw]:
+                up_weight[arc_vw] = cost
+                up_via[arc_vw] = triangles[i + 3]
+            cost = down_weight[arc_xw] + up_weight[arc_xv]
+            if cost < down_weight[arc_vw]:
+                down_weight[arc_vw] = cost
+                down_via[arc_vw] = triangles[i + 3]
+
+        return CCHMetric(graph.epoch, up_weight, down_weight, up_via, down_via)
+
+    # ========================================
+    # CONSULTA
+    # ========================================
+
+    def query(self, metric: CCHMetric, source: int, target: int) -> Tuple[float, List[int]]:
+        """
+        Caminho de custo mínimo entre dois nós.
+
+        Args:
+            metric: Pesos personalizados
+            source: ID do nó de origem
+            target: ID do nó de destino
+
+        Returns:
+            Tuple[float, List[int]]: (custo, caminho com os nós originais); (inf, []) se não existe
+        """
+        if source == target:
+            return 0.0, [source]
+
+        dist = ({source: 0.0}, {target: 0.0})
+        parent: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+        heaps = ([(0.0, source)], [(0.0, target)])
+        weights = (metric.up_weight, metric.down_weight)
+        up_arcs = self.up_arcs
+        best = INF
+        meeting_node = None
+
+        direction = 0
+        while True:
+            # Alterna as direções; cada uma pára quando o topo já não melhora o melhor caminho
+            active = [bool(heap) and heap[0][0] < best for heap in heaps]
+            if not active[0] and not active[1]:
+                break
+            if not active[direction]:
+                direction = 1 - direction
+            heap = heaps[direction]
+            d, u = heapq.heappop(heap)
+            dist_dir = dist[direction]
+            if d > dist_dir[u]:
+                direction = 1 - direction
+                continue
+
+            other_d = dist[1 - direction].get(u)
+            if other_d is not None and d + other_d < best:
+                best = d + other_d
+                meeting_node = u
+
+            weight = weights[direction]
+            parent_dir = parent[direction]
+            for w, arc in up_arcs[u]:
+                nd = d + weight[arc]
+                if nd < dist_dir.get(w, INF):
+                    dist_dir[w] = nd
+                    parent_dir[w] = u
+                    heapq.heappush(heap, (nd, w))
+            direction = 1 - direction
+
+        if meeting_node is None:
+            return INF, []
+
+        # Caminho na hierarquia: subida desde a origem e descida até ao destino
+        up_path = [meeting_node]
+        while up_path[-1] in parent[0]:
+            up_path.append(parent[0][up_path[-1]])
+        up_path.reverse()
+        down_path = [meeting_node]
+        while down_path[-1] in parent[1]:
+            down_path.append(parent[1][down_path[-1]])
+
+        hierarchy_path = up_path + down_path[1:]
+        path = [source]
+        for a, b in zip(hierarchy_path, hierarchy_path[1:]):
+            self._unpack(metric, a, b, path)
+        return best, path
+
+    def _unpack(self, metric: CCHMetric, a: int, b: int, path: List[int]) -> None:
+        """Acrescenta ao caminho os nós originais do arco a -> b (sem a)."""
+        rank = self.rank
+        arc_of = self.arc_of
+        stack = [(a, b)]
+        while stack:
+            u, v = stack.pop()
+            if rank[u] < rank[v]:
+                via = metric.up_via[arc_of[(u, v)]]
+            else:
+                via = metric.down_via[arc_of[(v, u)]]
+            if via < 0:
+                path.append(v)
+            else:
+                stack.append((via, v))
+                stack.append((u, via))
+
+
+def get_contraction_hierarchy(graph: Graph) -> ContractionHierarchy:
+    """Retorna a hierarquia do grafo, construindo-a na primeira utilização."""
+    if graph._contraction_hierarchy is None:
+        graph._contraction_hierarchy = ContractionHierarchy(graph)
+    return graph._contraction_hierarchy
+
+
+def contraction_hierarchies(start: Position, goal: Position, graph: Graph,
+                            vehicle_type: Optional[VehicleType] = None) -> Tuple[float, float, List[int]]:
+    """
+    Procura com Contraction Hierarchies - mesmo custo unificado do Uniform Cost,
+    com consultas muito mais rápidas depois do pré-processamento.
+
+    Híbridos com pouca bateria (custos dependentes do estado) usam o Dijkstra
+    bidirecional.
+
+    Args:
+        start: Posição inicial
+        goal: Posição objetivo
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo (opcional, para cálculos precisos de custo)
+
+    Returns:
+        Tuple[float, float, List[int]]: (distância total em metros, tempo total em minutos, caminho)
+    """
+    start_node = graph.find_closest_node(start)
+    goal_node = graph.find_closest_node(goal)
+
+    hierarchy = get_contraction_hierarchy(graph)
+    metric = hierarchy.metric(graph, vehicle_type)
+    if metric is None:
+        return bidirectional_dijkstra(start, goal, graph, vehicle_type=vehicle_type)
+
+    _, path = hierarchy.query(metric, start_node.id, goal_node.id)
+    if not path:
+        return float('inf'), float('inf'), []
+
+    total_distance, total_time = graph.calculate_path_metrics(path)
+    return total_distance, total_time, path
@@ -4,6 +4,7 @@ Implementação do algoritmo A* com suporte a múltiplos critérios de heurísti
 - 'time': Heurística de tempo estimado (considera clima/trânsito)
 - 'cost': Heurística de custo operacional
 - 'combined': Heurística combinada
+- 'landmarks': Heurística ALT (limites inferiores pré-calculados com landmarks)
 
 IMPORTANTE: O custo g(n) das arestas usa a função de custo unificada que combina:
 - Tempo de resposta
@@ -20,8 +21,9 @@ import heapq
 import itertools
 
 # Importa preços de energia/combustível e função de custo
-from algorithms.informed.heuristics import calculate_heuristic
-from algorithms.utils.cost_function import calculate_edge_cost
+from algorithms.informed.heuristics import make_heuristic
+from algorithms.utils.cost_layers import weighted_neighbors
+from algorithms.utils.workspace import search_workspace
 from vehicle.vehicle_types import VehicleType
 
 def a_star(start: Position, goal: Position, graph: Graph, criterion: str = 'distance', 
@@ -43,56 +45,42 @@ def a_star(start: Position, goal: Position, graph: Graph, criterion: str = 'dist
     """
     start_node = graph.find_closest_node(start)
     goal_node = graph.find_closest_node(goal)
+
+    # h(n) especializada uma vez para o objetivo, o veículo e o instante desta procura
+    heuristic = make_heuristic(criterion, goal_node.id, graph, vehicle_type=vehicle_type,
+                               event_manager=event_manager, current_time=current_time)
+    
+    # Custo unificado das arestas (pré-calculado por perfil quando é estático)
+    expand = weighted_neighbors(graph, vehicle_type)
     
-    # Priority Queue armazena (f_score, counter, node)
+    # Priority Queue armazena (f_score, counter, node_id)
     open_set = []
     counter = itertools.count()  # Contador para desempate
     
-    # Inicializa scores
-    g_score = {node.id: float('inf') for node in graph.nodes}
-    g_score[start_node.id] = 0
-    
-    h_start = calculate_heuristic(start_node.position, goal_node.position, criterion, 
-                                   vehicle_type=vehicle_type, event_manager=event_manager, 
-                                   node_id=start_node.id, current_time=current_time)
-    f_score = {node.id: float('inf') for node in graph.nodes}
-    f_score[start_node.id] = h_start
-    
-    heapq.heappush(open_set, (f_score[start_node.id], next(counter), start_node))
-    came_from = {}
-    
-    while open_set:
-        _, _, current = heapq.heappop(open_set)
+    with search_workspace(graph) as workspace:
+        # g(n) e nó anterior vivem na área de trabalho: só os nós alcançados são escritos
+        workspace.set(start_node.id, 0.0)
+        g_of = workspace.g_of
         
-        if current.id == goal_node.id:
-            path = []
-            while current.id in came_from:
-                path.append(current.id)
-                current = came_from[current.id]
-            path.append(start_node.id)
-            path.reverse()
-            total_distance, total_time = graph.calculate_path_metrics(path)
-            return total_distance, total_time, path
-            
-        for edge in graph.edges[current.id]:
-            if not edge.get("open", True):
-                continue
-            neighbor = graph.get_node(edge["target"])
+        heapq.heappush(open_set, (heuristic(start_node.id), next(counter), start_node.id))
+        
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
             
-            edge_distance = edge.get("distance", 0.0)
-            edge_time = edge.get("time", 0.0)
-            edge_cost = calculate_edge_cost(edge_distance, edge_time, vehicle_type)
-            tentative_g_score = g_score[current.id] + edge_cost
+            if current == goal_node.id:
+                path = workspace.path_to(current)
+                total_distance, total_time = graph.calculate_path_metrics(path)
+                return total_distance, total_time, path
             
-            if tentative_g_score < g_score[neighbor.id]:
-                came_from[neighbor.id] = current
-                g_score[neighbor.id] = tentative_g_score
+            g_current = g_of(current)
+            for target, edge_cost in expand(current):
+                tentative_g_score = g_current + edge_cost
                 
-                # h(n) varia conforme o critério da heurística
-                h_score = calculate_heuristic(neighbor.position, goal_node.position, criterion,
-                                              vehicle_type=vehicle_type, event_manager=event_manager, 
-                                              node_id=neighbor.id, current_time=current_time)
-                f_score[neighbor.id] = tentative_g_score + h_score
-                heapq.heappush(open_set, (f_score[neighbor.id], next(counter), neighbor))
+                if tentative_g_score < g_of(target):
+                    workspace.set(target, tentative_g_score, current)
+                    
+                    # h(n) varia conforme o critério da heurística
+                    f_score = tentative_g_score + heuristic(target)
+                    heapq.heappush(open_set, (f_score, next(counter), target))
                 
-    return float('inf'), float('inf'), []
\ No newline at end of file
+    return float('inf'), float('inf'), []
@@ -0,0 +1,162 @@
+"""
+Procura bidirecional: A* bidirecional e Dijkstra bidirecional.
+
+Duas procuras correm em simultâneo, uma a partir da origem (pelas arestas de
+saída) e outra a partir do destino (pelas arestas de entrada), e param quando
+se encontram com a garantia de que nenhum caminho melhor pode existir. Em
+trajetos ponto-a-ponto num grafo grande exploram cerca de metade dos nós.
+
+O custo g(n) das arestas é o mesmo custo unificado do A* e do Uniform Cost
+(calculate_edge_cost). No A* bidirecional as duas procuras usam o potencial
+médio p(n) = (h_destino(n) - h_origem(n)) / 2, o que as torna consistentes
+entre si; com p(n) = 0 obtém-se o Dijkstra bidirecional.
+"""
+from typing import Callable, List, Optional, Tuple
+from graph.graph import Graph
+from graph.position import Position
+import heapq
+import itertools
+
+from algorithms.informed.heuristics import make_heuristic
+from algorithms.informed.landmarks import get_landmark_tables
+from algorithms.utils.cost_layers import weighted_neighbors
+from vehicle.vehicle_types import VehicleType
+
+
+def bidirectional_a_star(start: Position, goal: Position, graph: Graph, criterion: str = 'distance',
+                         event_manager=None, current_time: int = None,
+                         vehicle_type: Optional[VehicleType] = None) -> Tuple[float, float, List[int]]:
+    """
+    A* bidirecional com potenciais médios.
+
+    Args:
+        start: Posição inicial
+        goal: Posição objetivo
+        graph: Grafo com o mapa
+        criterion: Tipo de heurística ('distance', 'time', 'cost', 'combined', etc.)
+        event_manager: Gestor de eventos (opcional, para heurísticas que consideram clima/trânsito)
+        current_time: Tempo atual em minutos (opcional, usado para verificar intervalos de eventos)
+        vehicle_type: Tipo de veículo (opcional, para custos e heurísticas de custo)
+
+    Returns:
+        Tuple[float, float, List[int]]: (distância total em metros, tempo total em minutos, caminho)
+    """
+    start_node = graph.find_closest_node(start)
+    goal_node = graph.find_closest_node(goal)
+
+    if criterion == 'landmarks':
+        tables = get_landmark_tables(graph, vehicle_type)
+
+        def potential(node_id: int) -> float:
+            return (tables.lower_bound(node_id, goal_node.id) - tables.lower_bound(start_node.id, node_id)) / 2.0
+    else:
+        h_goal = make_heuristic(criterion, goal_node.id, graph, vehicle_type=vehicle_type,
+                                event_manager=event_manager, current_time=current_time)
+        h_start = make_heuristic(criterion, start_node.id, graph, vehicle_type=vehicle_type,
+                                 event_manager=event_manager, current_time=current_time)
+
+        def potential(node_id: int) -> float:
+            return (h_goal(node_id) - h_start(node_id)) / 2.0
+
+    return _bidirectional_search(graph, start_node.id, goal_node.id, vehicle_type, potential)
+
+
+def bidirectional_dijkstra(start: Position, goal: Position, graph: Graph,
+                           vehicle_type: Optional[VehicleType] = None) -> Tuple[float, float, List[int]]:
+    """
+    Dijkstra bidirecional com o custo unificado das arestas (sem heurística).
+
+    Args:
+        start: Posição inicial
+        goal: Posição objetivo
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo (opcional, para cálculos precisos de custo)
+
+    Returns:
+        Tuple[float, float, List[int]]: (distância total em metros, tempo total em minutos, caminho)
+    """
+    start_node = graph.find_closest_node(start)
+    goal_node = graph.find_closest_node(goal)
+    return _bidirectional_search(graph, start_node.id, goal_node.id, vehicle_type, None)
+
+
+def _bidirectional_search(graph: Graph, start_id: int, goal_id: int,
+                          vehicle_type: Optional[VehicleType],
+                          potential: Optional[Callable[[int], float]]) -> Tuple[float, float, List[int]]:
+    """
+    Núcleo comum às duas variantes.
+
+    A procura para a frente ordena por g_f(n) + p(n) e a procura para trás por
+    g_b(n) - p(n). Pára quando a soma dos topos das duas filas não é inferior
+    ao melhor caminho já encontrado (mu).
+    """
+    if start_id == goal_id:
+        return 0.0, 0.0, [start_id]
+
+    potentials = {}
+
+    def p(node_id: int) -> float:
+        if potential is None:
+            return 0.0
+        value = potentials.get(node_id)
+        if value is None:
+            value = potential(node_id)
+            potentials[node_id] = value
+        return value
+
+    counter = itertools.count()  # Contador para desempate
+    g = ({start_id: 0.0}, {goal_id: 0.0})          # (para a frente, para trás)
+    came_from = ({}, {})                           # pai em cada direção
+    open_sets = ([(p(start_id), next(counter), start_id)],
+                 [(-p(goal_id), next(counter), goal_id)])
+    expand = (weighted_neighbors(graph, vehicle_type), weighted_neighbors(graph, vehicle_type, reverse=True))
+    sign = (1.0, -1.0)
+
+    best_cost = float('inf')
+    meeting_node = None
+
+    while open_sets[0] and open_sets[1]:
+        if open_sets[0][0][0] + open_sets[1][0][0] >= best_cost:
+            break
+
+        # Expande a direção com a fila mais pequena
+        direction = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        other = 1 - direction
+        key, _, current = heapq.heappop(open_sets[direction])
+        g_current = g[direction][current]
+
+        # Entrada desatualizada (o nó já foi melhorado depois de ser inserido)
+        if key > g_current + sign[direction] * p(current):
+            continue
+
+        for neighbor, edge_cost in expand[direction](current):
+            tentative_g = g_current + edge_cost
+
+            if tentative_g < g[direction].get(neighbor, float('inf')):
+                g[direction][neighbor] = tentative_g
+                came_from[direction][neighbor] = current
+                heapq.heappush(open_sets[direction],
+                               (tentative_g + sign[direction] * p(neighbor), next(counter), neighbor))
+
+                # Caminho completo através de neighbor?
+                g_other = g[other].get(neighbor)
+                if g_other is not None and tentative_g + g_other < best_cost:
+                    best_cost = tentative_g + g_other
+                    meeting_node = neighbor
+
+    if meeting_node is None:
+        return float('inf'), float('inf'), []
+
+    path = [meeting_node]
+    node = meeting_node
+    while node in came_from[0]:
+        node = came_from[0][node]
+        path.append(node)
+    path.reverse()
+    node = meeting_node
+    while node in came_from[1]:
+        node = came_from[1][node]
+        path.append(node)
+
+    total_distance, total_time = graph.calculate_path_metrics(path)
+    return total_distance, total_time, path
@@ -3,9 +3,14 @@ from graph.graph import Graph
 from graph.position import Position
 import heapq
 import itertools
-from algorithms.informed.heuristics import calculate_heuristic
+from algorithms.informed.heuristics import make_heuristic
+from algorithms.utils.workspace import search_workspace
 from vehicle.vehicle_types import VehicleType
 
+# Estados dos nós na área de trabalho
+IN_OPEN_SET = 1
+VISITED = 2
+
 def greedy_bfs(start: Position, goal: Position, graph: Graph, criterion: str = 'distance',
                event_manager=None, current_time: int = None, vehicle_type: Optional[VehicleType] = None) -> Tuple[float, float, List[int]]:
     """
@@ -28,50 +33,42 @@ def greedy_bfs(start: Position, goal: Position, graph: Graph, criterion: str = '
     """
     start_node = graph.find_closest_node(start)
     goal_node = graph.find_closest_node(goal)
+
+    # h(n) especializada uma vez para o objetivo, o veículo e o instante desta procura
+    heuristic = make_heuristic(criterion, goal_node.id, graph, vehicle_type=vehicle_type,
+                               event_manager=event_manager, current_time=current_time)
     
     open_set = []
     counter = itertools.count()  # Contador para desempate quando h_scores são iguais
-    # Greedy usa apenas h(n) para ordenar
-    h_start = calculate_heuristic(start_node.position, goal_node.position, criterion,
-                                   vehicle_type=vehicle_type, event_manager=event_manager, 
-                                   node_id=start_node.id, current_time=current_time)
-    heapq.heappush(open_set, (h_start, next(counter), start_node))
     
-    came_from = {}
-    visited = set()
-    in_open_set = {start_node.id}  # Rastreia nós já adicionados ao open_set
-    
-    while open_set:
-        _, _, current = heapq.heappop(open_set)
+    with search_workspace(graph) as workspace:
+        # Estado de cada nó na área de trabalho: IN_OPEN_SET ou VISITED (não escrito = por ver)
+        state = workspace.state
+        touched = workspace.touched
         
-        # Ignora se já foi visitado (pode acontecer com nós duplicados no heap)
-        if current.id in visited:
-            continue
+        # Greedy usa apenas h(n) para ordenar
+        workspace.set(start_node.id, 0.0, state=IN_OPEN_SET)
+        heapq.heappush(open_set, (heuristic(start_node.id), next(counter), start_node.id))
         
-        if current.id == goal_node.id:
-            path = []
-            while current.id in came_from:
-                path.append(current.id)
-                current = came_from[current.id]
-            path.append(start_node.id)
-            path.reverse()
-            total_distance, total_time = graph.calculate_path_metrics(path)
-            return total_distance, total_time, path
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
             
-        visited.add(current.id)
-        
-        for edge in graph.edges[current.id]:
-            if not edge.get("open", True):
+            # Ignora se já foi visitado (pode acontecer com nós duplicados no heap)
+            if state[current] == VISITED:
                 continue
-            neighbor = graph.get_node(edge["target"])
-            # Só adiciona se não foi visitado E não está já no open_set
-            if neighbor.id not in visited and neighbor.id not in in_open_set:
-                came_from[neighbor.id] = current
-                in_open_set.add(neighbor.id)
-                # Calcula heurística baseada no critério
-                h_score = calculate_heuristic(neighbor.position, goal_node.position, criterion,
-                                              vehicle_type=vehicle_type, event_manager=event_manager, 
-                                              node_id=neighbor.id, current_time=current_time)
-                heapq.heappush(open_set, (h_score, next(counter), neighbor))
+            
+            if current == goal_node.id:
+                path = workspace.path_to(current)
+                total_distance, total_time = graph.calculate_path_metrics(path)
+                return total_distance, total_time, path
+            
+            state[current] = VISITED
+            
+            for target, _, _ in graph.neighbors(current):
+                # Só adiciona se não foi visitado E não está já no open_set
+                if not touched(target):
+                    workspace.set(target, 0.0, current, state=IN_OPEN_SET)
+                    # Calcula heurística baseada no critério
+                    heapq.heappush(open_set, (heuristic(target), next(counter), target))
                 
-    return float('inf'), float('inf'), []
\ No newline at end of file
+    return float('inf'), float('inf'), []
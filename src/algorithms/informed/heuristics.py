@@ -1,6 +1,9 @@
 # Funções de heurística centralizadas
-from typing import Optional
+from array import array
+from typing import Callable, Optional, Tuple
+import math
 from graph.position import Position
+from algorithms.informed.landmarks import landmark_heuristic
 from vehicle.vehicle_types import Eletric, Combustion, Hybrid, VehicleType
 
 # Constantes importadas do config
@@ -156,7 +159,7 @@ def calculate_heuristic(pos1: Position, pos2: Position, criterion: str,
     Args:
         pos1: Posição atual
         pos2: Posição objetivo
-        criterion: Tipo de heurística ('distance', 'time', 'cost', 'environmental', 'combined')
+        criterion: Tipo de heurística ('distance', 'time', 'cost', 'environmental', 'combined', 'landmarks')
         vehicle_type: Tipo de veículo (opcional, contém average_speed e consumo)
         event_manager: Gestor de eventos (opcional, para 'time' considerar clima/trânsito)
         node_id: ID do nó atual (opcional, usado para heurística de tempo)
@@ -184,11 +187,202 @@ def calculate_heuristic(pos1: Position, pos2: Position, criterion: str,
         return _heuristic_combined(pos1, pos2, dist_meters, dist_km, speed_kmh, 
                                    vehicle_type, event_manager, node_id, current_time)
     
+    # 'landmarks' precisa do grafo e do nó objetivo (ver algorithms.informed.landmarks);
+    # sem esse contexto usa a distância euclidiana
+    if criterion == 'landmarks':
+        criterion = 'distance'
+
     if criterion in heuristic_functions:
         return heuristic_functions[criterion](dist_meters, dist_km, speed_kmh, 
                                                vehicle_type, event_manager, 
                                                node_id, current_time)
 
+# =============================================================================
+# FÁBRICA DE HEURÍSTICAS (UMA POR PROCURA)
+# =============================================================================
+
+def make_heuristic(criterion: str, goal_id: int, graph, vehicle_type: Optional[VehicleType] = None,
+                   event_manager=None, current_time: int = None) -> Callable[[int], float]:
+    """
+    Cria a função h(n) de uma procura, já especializada para o critério, o
+    objetivo, o veículo e o instante. Dá os mesmos valores que
+    calculate_heuristic, mas a velocidade, os consumos e a função do critério
+    são escolhidos uma só vez e os fatores de clima/trânsito de cada nó são
+    consultados no EventManager apenas na primeira vez que o nó é avaliado.
+
+    Args:
+        criterion: Tipo de heurística (ver HEURISTICS)
+        goal_id: ID do nó objetivo
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo (opcional)
+        event_manager: Gestor de eventos (opcional)
+        current_time: Tempo atual em minutos (opcional)
+
+    Returns:
+        Callable[[int], float]: Função node_id -> h(n)
+    """
+    if criterion == 'landmarks':
+        return landmark_heuristic(graph, goal_id, vehicle_type)
+
+    h, _ = _compile_heuristic(criterion, vehicle_type, event_manager, current_time)
+    goal_position = graph.get_node(goal_id).position
+    gx, gy = goal_position.x, goal_position.y
+    sqrt = math.sqrt
+
+    coords = getattr(graph, 'coords', None)
+    if coords is not None:
+        # Grafo CSR: lê as coordenadas do array, sem passar pelos objetos Node
+        def heuristic(node_id: int) -> float:
+            dist_meters = sqrt((coords[2 * node_id] - gx)**2 + (coords[2 * node_id + 1] - gy)**2)
+            return h(dist_meters, dist_meters / 1000.0, node_id)
+    else:
+        get_node = graph.get_node
+
+        def heuristic(node_id: int) -> float:
+            position = get_node(node_id).position
+            dist_meters = sqrt((position.x - gx)**2 + (position.y - gy)**2)
+            return h(dist_meters, dist_meters / 1000.0, node_id)
+
+    return heuristic
+
+
+def heuristic_table(criterion: str, goal_id: int, graph, vehicle_type: Optional[VehicleType] = None,
+                    event_manager=None, current_time: int = None) -> array:
+    """
+    Calcula h(n) de todos os nós do grafo para um objetivo.
+
+    Se o grafo guarda as coordenadas num array (CSRGraph, atributo coords),
+    o NumPy está instalado e o critério só depende da distância
+    (sem consultas por nó ao EventManager nem estado de bateria de híbridos),
+    a tabela é calculada numa única passagem vetorial. Caso contrário é
+    calculada nó a nó com a função de make_heuristic.
+
+    Args:
+        criterion: Tipo de heurística (ver HEURISTICS)
+        goal_id: ID do nó objetivo
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo (opcional)
+        event_manager: Gestor de eventos (opcional)
+        current_time: Tempo atual em minutos (opcional)
+
+    Returns:
+        array: array('d') com h(n) indexado pelo ID do nó
+    """
+    n = len(graph.nodes)
+    if criterion == 'landmarks':
+        heuristic = landmark_heuristic(graph, goal_id, vehicle_type)
+        return array('d', (heuristic(node_id) for node_id in range(n)))
+
+    h, vectorizable = _compile_heuristic(criterion, vehicle_type, event_manager, current_time)
+    coords = getattr(graph, 'coords', None)
+    if vectorizable and coords is not None:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            goal_position = graph.get_node(goal_id).position
+            xy = np.frombuffer(coords, dtype=np.float64).reshape(n, 2)
+            dist_meters = np.sqrt((xy[:, 0] - goal_position.x)**2 + (xy[:, 1] - goal_position.y)**2)
+            values = np.asarray(h(dist_meters, dist_meters / 1000.0, None), dtype=np.float64)
+            return array('d', values.tobytes())
+
+    heuristic = make_heuristic(criterion, goal_id, graph, vehicle_type, event_manager, current_time)
+    return array('d', (heuristic(node_id) for node_id in range(n)))
+
+
+def _compile_heuristic(criterion: str, vehicle_type: Optional[VehicleType], event_manager,
+                       current_time: int) -> Tuple[Callable[[float, float, int], float], bool]:
+    """
+    Escolhe a função (dist_meters, dist_km, node_id) -> h de um critério.
+
+    Returns:
+        Tuple[Callable, bool]: (função, True se a função só depende da distância
+                               e aceita também arrays NumPy)
+    """
+    speed_kmh = getattr(vehicle_type, 'average_speed', DEFAULT_SPEED_KMH) if vehicle_type else DEFAULT_SPEED_KMH
+    meters_per_minute = speed_kmh * 1000.0 / 60.0
+
+    if criterion == 'distance':
+        return (lambda dist_meters, dist_km, node_id: dist_meters), True
+
+    if criterion == 'time':
+        if event_manager is None:
+            return (lambda dist_meters, dist_km, node_id:
+                    (dist_km / speed_kmh) * 60.0 * meters_per_minute), True
+        multiplier = _event_factor(lambda node_id: event_manager.get_weather_multiplier(node_id, current_time)
+                                   * event_manager.get_traffic_multiplier(node_id, current_time))
+        return (lambda dist_meters, dist_km, node_id:
+                (dist_km / speed_kmh) * 60.0 * multiplier(node_id) * meters_per_minute), False
+
+    if criterion == 'cost':
+        if vehicle_type is None:
+            return (lambda dist_meters, dist_km, node_id: dist_km * 0.15 * EURO_TO_METERS), True
+        if isinstance(vehicle_type, Eletric):
+            rate = vehicle_type.battery_consumption / 100.0
+            return (lambda dist_meters, dist_km, node_id: rate * dist_km * PRECO_BATERIA * EURO_TO_METERS), True
+        if isinstance(vehicle_type, Combustion):
+            rate = vehicle_type.fuel_consumption / 100.0
+            return (lambda dist_meters, dist_km, node_id: rate * dist_km * PRECO_COMBUSTIVEL * EURO_TO_METERS), True
+        # Híbrido: depende da bateria atual (fixa durante a procura)
+        return (lambda dist_meters, dist_km, node_id:
+                calculate_fuel_cost(vehicle_type, dist_km) * EURO_TO_METERS), False
+
+    if criterion == 'environmental':
+        if isinstance(vehicle_type, Eletric):
+            return (lambda dist_meters, dist_km, node_id: dist_meters), True
+        if vehicle_type is None or isinstance(vehicle_type, Combustion):
+            # Emissões só são zero com distância zero, onde ambos os ramos dão 0
+            return (lambda dist_meters, dist_km, node_id:
+                    EMISSIONS_COMBUSTION_G_PER_KM * dist_km * CO2_TO_METERS), True
+
+        def environmental(dist_meters: float, dist_km: float, node_id: int) -> float:
+            emissoes_g = calculate_emissions(vehicle_type, dist_km)
+            return dist_meters if emissoes_g == 0.0 else emissoes_g * CO2_TO_METERS
+        return environmental, False
+
+    if criterion == 'traffic_avoidance':
+        if event_manager is None:
+            return (lambda dist_meters, dist_km, node_id: dist_meters), True
+        penalty = _event_factor(lambda node_id: _traffic_penalty(event_manager, node_id, current_time))
+        return (lambda dist_meters, dist_km, node_id: dist_meters * penalty(node_id)), False
+
+    if criterion == 'combined':
+        parts = [_compile_heuristic(name, vehicle_type, event_manager, current_time)
+                 for name in ('distance', 'time', 'cost', 'environmental', 'traffic_avoidance')]
+        (h_distance, _), (h_time, _), (h_cost, _), (h_environmental, _), (h_traffic, _) = parts
+
+        def combined(dist_meters: float, dist_km: float, node_id: int) -> float:
+            return (h_distance(dist_meters, dist_km, node_id) + h_time(dist_meters, dist_km, node_id)
+                    + h_cost(dist_meters, dist_km, node_id) + h_environmental(dist_meters, dist_km, node_id)
+                    + h_traffic(dist_meters, dist_km, node_id)) / 5.0
+        return combined, all(vectorizable for _, vectorizable in parts)
+
+    raise ValueError(f"Heurística desconhecida '{criterion}' (use uma de {tuple(HEURISTICS)})")
+
+
+def _event_factor(compute: Callable[[int], float]) -> Callable[[int], float]:
+    """Memoriza um fator por nó (o instante é fixo durante uma procura)."""
+    factors = {}
+
+    def factor(node_id: int) -> float:
+        value = factors.get(node_id)
+        if value is None:
+            value = factors[node_id] = compute(node_id)
+        return value
+    return factor
+
+
+def _traffic_penalty(event_manager, node_id: int, current_time: int) -> float:
+    """Penalização de trânsito de um nó (igual à de _heuristic_traffic_avoidance)."""
+    traffic = event_manager.get_traffic_at_node(node_id, current_time)
+    traffic_value = traffic.value if hasattr(traffic, 'value') else str(traffic)
+    penalty = TRAFFIC_PENALTIES.get(traffic_value, 1.0)
+    if penalty > 1.3:
+        penalty *= TRAFFIC_PROPAGATION_FACTOR
+    return penalty
+
+
 # =============================================================================
 # DICIONÁRIO DE HEURÍSTICAS DISPONÍVEIS
 # =============================================================================
@@ -200,4 +394,8 @@ HEURISTICS = {
     'environmental': 'Impacto Ambiental (CO₂)',
     'traffic_avoidance': 'Evitar Trânsito (penaliza zonas congestionadas)',
     'combined': 'Combinada (média de todas)',
-}
\ No newline at end of file
+    'landmarks': 'Landmarks ALT (limite inferior pré-calculado)',
+}
+
+# Heurísticas que consultam o EventManager (dependem do instante da procura)
+EVENT_HEURISTICS = ('time', 'traffic_avoidance', 'combined')
@@ -0,0 +1,207 @@
+"""
+Heurística ALT (A*, Landmarks, desigualdade Triangular).
+
+No pré-processamento escolhem-se K nós de referência (landmarks) e calcula-se,
+com Dijkstra, o custo mínimo de cada landmark L para todos os nós, d(L, v), e
+de todos os nós para L, d(v, L). Pela desigualdade triangular:
+
+    d(u, v) >= d(L, v) - d(L, u)
+    d(u, v) >= d(u, L) - d(v, L)
+
+e o maior destes valores sobre todos os landmarks é um limite inferior
+admissível e consistente do custo de u até v.
+
+Os custos usados são os de calculate_edge_cost_lower_bound com o tempo base das
+arestas (sem clima nem trânsito) e com todas as estradas abertas. Como os
+eventos só aumentam tempos (multiplicadores >= 1) ou fecham estradas, as
+tabelas continuam a ser limites inferiores válidos com qualquer estado dos
+eventos e não precisam de ser recalculadas quando o EventManager os aplica.
+Só são invalidadas quando a topologia do grafo muda (add_node/add_edge).
+"""
+from array import array
+from typing import Callable, List, Optional, Tuple
+import heapq
+
+from graph.graph import Graph
+from algorithms.utils.cost_function import calculate_edge_cost_lower_bound, cost_profile_key
+from vehicle.vehicle_types import VehicleType
+
+# Constantes importadas do config
+try:
+    from config import ALT_NUM_LANDMARKS
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from config import ALT_NUM_LANDMARKS
+
+INF = float('inf')
+
+
+class LandmarkTables:
+    """
+    Tabelas de distâncias de/para cada landmark para um perfil de custo.
+
+    Attributes:
+        landmarks: IDs dos nós escolhidos como landmarks
+        from_landmark: Para cada landmark L, array com d(L, v) para cada nó v
+        to_landmark: Para cada landmark L, array com d(v, L) para cada nó v
+    """
+
+    def __init__(self, landmarks: List[int], from_landmark: List[array], to_landmark: List[array]) -> None:
+        self.landmarks = landmarks
+        self.from_landmark = from_landmark
+        self.to_landmark = to_landmark
+
+    def lower_bound(self, u: int, v: int) -> float:
+        """
+        Limite inferior do custo do caminho mais curto de u até v.
+
+        Args:
+            u: ID do nó de origem
+            v: ID do nó de destino
+
+        Returns:
+            float: Limite inferior (0 se nenhum landmark alcança ambos os nós)
+        """
+        best = 0.0
+        for from_l, to_l in zip(self.from_landmark, self.to_landmark):
+            # d(L, v) - d(L, u)
+            du = from_l[u]
+            dv = from_l[v]
+            if du != INF and dv != INF and dv - du > best:
+                best = dv - du
+            # d(u, L) - d(v, L)
+            du = to_l[u]
+            dv = to_l[v]
+            if du != INF and dv != INF and du - dv > best:
+                best = du - dv
+        return best
+
+
+def get_landmark_tables(graph: Graph, vehicle_type: Optional[VehicleType] = None,
+                        num_landmarks: int = ALT_NUM_LANDMARKS) -> LandmarkTables:
+    """
+    Retorna as tabelas ALT do grafo para o perfil do veículo, calculando-as
+    na primeira utilização.
+
+    Args:
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo (define os custos das arestas)
+        num_landmarks: Número de landmarks a escolher
+
+    Returns:
+        LandmarkTables
+    """
+    if graph._landmark_tables is None:
+        graph._landmark_tables = {}
+    key = (cost_profile_key(vehicle_type), num_landmarks)
+    tables = graph._landmark_tables.get(key)
+    if tables is None:
+        tables = build_landmark_tables(graph, vehicle_type, num_landmarks)
+        graph._landmark_tables[key] = tables
+    return tables
+
+
+def build_landmark_tables(graph: Graph, vehicle_type: Optional[VehicleType] = None,
+                          num_landmarks: int = ALT_NUM_LANDMARKS) -> LandmarkTables:
+    """
+    Escolhe os landmarks e calcula as tabelas de distâncias.
+
+    Os landmarks são escolhidos por seleção do mais afastado: o primeiro é o nó
+    mais distante do nó 0 e cada seguinte é o nó cuja distância ao landmark mais
+    próximo já escolhido é máxima. Nós inalcançáveis nunca são escolhidos.
+
+    Args:
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo (define os custos das arestas)
+        num_landmarks: Número de landmarks a escolher
+
+    Returns:
+        LandmarkTables
+    """
+    forward, backward = _lower_bound_adjacency(graph, vehicle_type)
+    n = len(forward)
+    landmarks: List[int] = []
+    from_landmark: List[array] = []
+    to_landmark: List[array] = []
+    if n == 0:
+        return LandmarkTables(landmarks, from_landmark, to_landmark)
+
+    # Distância de cada nó ao landmark mais próximo (começa pelo nó 0)
+    closest = _dijkstra(forward, 0)
+
+    while len(landmarks) < min(num_landmarks, n):
+        candidate = None
+        candidate_dist = -1.0
+        for v in range(n):
+            d = closest[v]
+            if d != INF and d > candidate_dist and v not in landmarks:
+                candidate = v
+                candidate_dist = d
+        if candidate is None:
+            break
+
+        from_l = _dijkstra(forward, candidate)
+        landmarks.append(candidate)
+        from_landmark.append(from_l)
+        to_landmark.append(_dijkstra(backward, candidate))
+
+        if len(landmarks) == 1:
+            closest = array('d', from_l)
+        else:
+            for v in range(n):
+                if from_l[v] < closest[v]:
+                    closest[v] = from_l[v]
+
+    return LandmarkTables(landmarks, from_landmark, to_landmark)
+
+
+def landmark_heuristic(graph: Graph, goal_id: int,
+                       vehicle_type: Optional[VehicleType] = None) -> Callable[[int], float]:
+    """
+    Heurística h(n) de um nó até ao objetivo, nas mesmas unidades que g(n).
+
+    Args:
+        graph: Grafo com o mapa
+        goal_id: ID do nó objetivo
+        vehicle_type: Tipo de veículo
+
+    Returns:
+        Callable[[int], float]: Função node_id -> h(n)
+    """
+    tables = get_landmark_tables(graph, vehicle_type)
+    return lambda node_id: tables.lower_bound(node_id, goal_id)
+
+
+def _lower_bound_adjacency(graph: Graph, vehicle_type: Optional[VehicleType]
+                           ) -> Tuple[List[List[Tuple[int, float]]], List[List[Tuple[int, float]]]]:
+    """Listas de adjacência (para a frente e invertida) com custos mínimos e todas as estradas abertas."""
+    n = len(graph.nodes)
+    forward: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+    backward: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+    for u, edges in graph.edges.items():
+        for edge in edges:
+            v = edge["target"]
+            weight = calculate_edge_cost_lower_bound(edge["distance"], edge.get("base_time", edge["time"]),
+                                                     vehicle_type)
+            forward[u].append((v, weight))
+            backward[v].append((u, weight))
+    return forward, backward
+
+
+def _dijkstra(adjacency: List[List[Tuple[int, float]]], source: int) -> array:
+    """Custos mínimos de source para todos os nós (INF se inalcançável)."""
+    dist = array('d', [INF]) * len(adjacency)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, weight in adjacency[u]:
+            nd = d + weight
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
@@ -1,25 +1,23 @@
-from typing import Any, List, Tuple
+from typing import List, Tuple
 from graph.graph import Graph
 from graph.position import Position
+from algorithms.utils.paths import reconstruct_path
 
 def dfs(start: Position, goal: Position, graph: Graph) -> Tuple[float, float, List[int]]:
     start_node = graph.find_closest_node(start)
     goal_node = graph.find_closest_node(goal)
-    stack = [(start_node, [start_node.id])]
-    visited = set()
-    visited.add(start_node.id)  # Marca como visitado ao adicionar à stack
+    stack = [start_node.id]
+    came_from = {start_node.id: None}  # Nó anterior no caminho (também marca como visitado)
     
     while stack:
-        current, path = stack.pop()
-        if current.id == goal_node.id:
+        current = stack.pop()
+        if current == goal_node.id:
+            path = reconstruct_path(came_from, current)
             total_distance, total_time = graph.calculate_path_metrics(path)
             return total_distance, total_time, path
         
-        for edge in graph.edges[current.id]:
-            if not edge.get("open", True):
-                continue
-            neighbor = graph.get_node(edge["target"])
-            if neighbor.id not in visited:
-                visited.add(neighbor.id)  # Marca como visitado ANTES de adicionar à stack
-                stack.append((neighbor, path + [neighbor.id]))
+        for target, _, _ in graph.neighbors(current):
+            if target not in came_from:
+                came_from[target] = current  # Marca como visitado ANTES de adicionar à stack
+                stack.append(target)
     return float('inf'), float('inf'), []
@@ -0,0 +1,168 @@
+"""
+Procuras de uma origem para muitos destinos (one-to-many) e de muitas origens
+para um destino (many-to-one).
+
+Um único Dijkstra a partir de um nó dá o custo mínimo até todos os outros, em
+vez de uma procura ponto-a-ponto por par. O many-to-one corre o mesmo Dijkstra
+sobre as arestas de entrada (graph.predecessors), pelo que também é correto em
+grafos dirigidos.
+
+Métricas disponíveis:
+- 'distance': distância em metros
+- 'time': tempo atual em minutos (com eventos aplicados)
+- 'cost': custo unificado (calculate_edge_cost), o mesmo do Uniform Cost e do A*
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+
+from graph.graph import Graph
+from algorithms.utils.cost_function import calculate_edge_cost
+from vehicle.vehicle_types import VehicleType
+
+METRICS = ('distance', 'time', 'cost')
+
+
+class ShortestPathTree:
+    """
+    Resultado de uma procura one-to-many / many-to-one.
+
+    Para cada nó alcançado guarda o custo na métrica da procura, a distância e
+    o tempo do caminho escolhido e o nó anterior no caminho. unified_cost tem
+    o custo unificado do caminho quando a métrica é 'cost' ou quando foi pedido
+    (None caso contrário).
+    Numa árvore invertida (many-to-one) os caminhos vão de cada nó até à raiz.
+    """
+
+    def __init__(self, root: int, reverse: bool, metric: str, cost: Dict[int, float],
+                 distance: Dict[int, float], time: Dict[int, float], parent: Dict[int, int],
+                 unified_cost: Optional[Dict[int, float]] = None) -> None:
+        self.root = root
+        self.reverse = reverse
+        self.metric = metric
+        self.cost = cost
+        self.distance = distance
+        self.time = time
+        self.parent = parent
+        self.unified_cost = unified_cost
+
+    def reached(self, node_id: int) -> bool:
+        """Indica se existe caminho entre o nó e a raiz."""
+        return node_id in self.cost
+
+    def cost_to(self, node_id: int) -> float:
+        """Custo na métrica da procura (inf se inalcançável)."""
+        return self.cost.get(node_id, float('inf'))
+
+    def metrics(self, node_id: int) -> Tuple[float, float]:
+        """
+        Returns:
+            Tuple[float, float]: (distância em metros, tempo em minutos) do caminho, inf se inalcançável
+        """
+        if node_id not in self.cost:
+            return float('inf'), float('inf')
+        return self.distance[node_id], self.time[node_id]
+
+    def path(self, node_id: int) -> List[int]:
+        """
+        Caminho entre a raiz e o nó (da raiz para o nó, ou do nó para a raiz
+        numa árvore invertida). Lista vazia se inalcançável.
+        """
+        if node_id not in self.cost:
+            return []
+        path = [node_id]
+        parent = self.parent
+        while path[-1] in parent:
+            path.append(parent[path[-1]])
+        if not self.reverse:
+            path.reverse()
+        return path
+
+
+def one_to_many(source_id: int, graph: Graph, targets: Optional[Iterable[int]] = None,
+                metric: str = 'cost', vehicle_type: Optional[VehicleType] = None,
+                reverse: bool = False, track_unified_cost: bool = False) -> ShortestPathTree:
+    """
+    Dijkstra a partir de um nó até vários destinos.
+
+    Args:
+        source_id: ID do nó de origem (raiz da árvore)
+        graph: Grafo com o mapa
+        targets: IDs dos nós de interesse; a procura pára quando todos estão
+                 resolvidos (None = todo o grafo). Só os nós alvo têm valores
+                 garantidamente finais.
+        metric: 'distance', 'time' ou 'cost'
+        vehicle_type: Tipo de veículo (para a métrica 'cost')
+        reverse: Se True, segue as arestas ao contrário (custos até à raiz)
+        track_unified_cost: Se True, guarda também o custo unificado dos caminhos
+                            escolhidos (já incluído quando a métrica é 'cost')
+
+    Returns:
+        ShortestPathTree
+    """
+    weight = _edge_weight(metric, vehicle_type)
+    expand = graph.predecessors if reverse else graph.neighbors
+
+    cost = {source_id: 0.0}
+    distance = {source_id: 0.0}
+    time = {source_id: 0.0}
+    parent: Dict[int, int] = {}
+    unified = {source_id: 0.0} if track_unified_cost and metric != 'cost' else None
+    remaining = set(targets) if targets is not None else None
+
+    heap = [(0.0, source_id)]
+    while heap:
+        current_cost, current = heapq.heappop(heap)
+        if current_cost > cost[current]:
+            continue
+        if remaining is not None:
+            remaining.discard(current)
+            if not remaining:
+                break
+
+        for neighbor, edge_distance, edge_time in expand(current):
+            new_cost = current_cost + weight(edge_distance, edge_time)
+            if new_cost < cost.get(neighbor, float('inf')):
+                cost[neighbor] = new_cost
+                distance[neighbor] = distance[current] + edge_distance
+                time[neighbor] = time[current] + edge_time
+                parent[neighbor] = current
+                if unified is not None:
+                    unified[neighbor] = unified[current] + calculate_edge_cost(edge_distance, edge_time, vehicle_type)
+                heapq.heappush(heap, (new_cost, neighbor))
+
+    if metric == 'cost':
+        unified = cost
+    return ShortestPathTree(source_id, reverse, metric, cost, distance, time, parent, unified)
+
+
+def many_to_one(target_id: int, graph: Graph, sources: Optional[Iterable[int]] = None,
+                metric: str = 'cost', vehicle_type: Optional[VehicleType] = None,
+                track_unified_cost: bool = False) -> ShortestPathTree:
+    """
+    Dijkstra invertido: custo mínimo de vários nós até um destino comum.
+
+    Args:
+        target_id: ID do nó de destino (raiz da árvore)
+        graph: Grafo com o mapa
+        sources: IDs dos nós de origem de interesse (None = todo o grafo)
+        metric: 'distance', 'time' ou 'cost'
+        vehicle_type: Tipo de veículo (para a métrica 'cost')
+        track_unified_cost: Se True, guarda também o custo unificado dos caminhos
+
+    Returns:
+        ShortestPathTree (path(origem) vai da origem até ao destino)
+    """
+    return one_to_many(target_id, graph, targets=sources, metric=metric,
+                       vehicle_type=vehicle_type, reverse=True,
+                       track_unified_cost=track_unified_cost)
+
+
+def _edge_weight(metric: str, vehicle_type: Optional[VehicleType]) -> Callable[[float, float], float]:
+    """Função (distância, tempo) -> peso da aresta na métrica pedida."""
+    if metric == 'distance':
+        return lambda edge_distance, edge_time: edge_distance
+    if metric == 'time':
+        return lambda edge_distance, edge_time: edge_time
+    if metric == 'cost':
+        return lambda edge_distance, edge_time: calculate_edge_cost(edge_distance, edge_time, vehicle_type)
+    raise ValueError(f"Métrica desconhecida '{metric}' (use uma de {METRICS})")
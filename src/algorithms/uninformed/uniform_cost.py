@@ -1,7 +1,8 @@
-from typing import Any, List, Tuple, Optional
+from typing import List, Tuple, Optional
 from graph.graph import Graph
 from graph.position import Position
-from algorithms.utils.cost_function import calculate_edge_cost
+from algorithms.utils.cost_layers import weighted_neighbors
+from algorithms.utils.paths import reconstruct_path
 from vehicle.vehicle_types import VehicleType
 import heapq
 import itertools
@@ -28,26 +29,31 @@ def uniform_cost_search(start: Position, goal: Position, graph: Graph,
     """
     start_node = graph.find_closest_node(start)
     goal_node = graph.find_closest_node(goal)
+    # Usa custo unificado (tempo, custo operacional, satisfação, ambiente),
+    # pré-calculado por perfil de veículo quando é estático
+    expand = weighted_neighbors(graph, vehicle_type)
     open_set = []
     counter = itertools.count()  # Contador para desempate
-    heapq.heappush(open_set, (0, next(counter), start_node, [start_node.id]))
+    heapq.heappush(open_set, (0, next(counter), start_node.id))
+    best_cost = {start_node.id: 0}
+    came_from = {start_node.id: None}
     visited = set()
     while open_set:
-        cost, _, current, path = heapq.heappop(open_set)
-        if current.id == goal_node.id:
+        cost, _, current = heapq.heappop(open_set)
+        if current == goal_node.id:
+            path = reconstruct_path(came_from, current)
             total_distance, total_time = graph.calculate_path_metrics(path)
             return total_distance, total_time, path
-        if current.id in visited:
+        if current in visited:
             continue
-        visited.add(current.id)
-        for edge in graph.edges[current.id]:
-            if not edge.get("open", True):
-                continue
-            neighbor = graph.get_node(edge["target"])
-            if neighbor.id not in visited:
-                # Usa custo unificado (tempo, custo operacional, satisfação, ambiente)
-                edge_distance = edge.get("distance", 0.0)
-                edge_time = edge.get("time", 0.0)
-                edge_cost = calculate_edge_cost(edge_distance, edge_time, vehicle_type)
-                heapq.heappush(open_set, (cost + edge_cost, next(counter), neighbor, path + [neighbor.id]))
+        visited.add(current)
+        for target, edge_cost in expand(current):
+            if target not in visited:
+                new_cost = cost + edge_cost
+                # Só entra na fila se melhora estritamente: em empate ganharia
+                # sempre a entrada mais antiga, que já lá está
+                if new_cost < best_cost.get(target, float('inf')):
+                    best_cost[target] = new_cost
+                    came_from[target] = current
+                    heapq.heappush(open_set, (new_cost, next(counter), target))
     return float('inf'), float('inf'), []
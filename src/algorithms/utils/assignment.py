@@ -0,0 +1,87 @@
+"""
+Atribuição ótima linhas × colunas (algoritmo húngaro).
+
+Usado pelo despacho em lote (Simulation, dispatch_mode='batch') para atribuir
+todos os pedidos pendentes de um tick aos veículos livres de uma vez, com o
+menor custo total, em vez de cada pedido ficar com o melhor veículo que resta.
+
+Versão O(n² · m) com potenciais (caminhos de aumento mais curtos), para
+matrizes retangulares com n linhas <= m colunas. Custos infinitos marcam
+pares proibidos; tem de existir uma atribuição completa com custo finito
+(o despacho garante-o com uma coluna "sem veículo" por pedido).
+"""
+from typing import List, Sequence
+
+INF = float('inf')
+
+
+def hungarian(cost: Sequence[Sequence[float]]) -> List[int]:
+    """
+    Atribui cada linha a uma coluna diferente minimizando a soma dos custos.
+
+    Args:
+        cost: Matriz n × m (lista de linhas) com n <= m; INF = par proibido
+
+    Returns:
+        List[int]: Coluna atribuída a cada linha
+
+    Raises:
+        ValueError: Se há mais linhas do que colunas ou se não existe
+                    atribuição completa com custo finito
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    if n > m:
+        raise ValueError(f"hungarian: {n} linhas para {m} colunas (são precisas n <= m)")
+
+    # Índices a partir de 1; a coluna 0 é a coluna fictícia de partida
+    u = [0.0] * (n + 1)          # Potenciais das linhas
+    v = [0.0] * (m + 1)          # Potenciais das colunas
+    match = [0] * (m + 1)        # match[j] = linha atribuída à coluna j (0 = livre)
+    way = [0] * (m + 1)          # Coluna anterior no caminho de aumento
+
+    for row in range(1, n + 1):
+        match[0] = row
+        j0 = 0
+        minv = [INF] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row_cost = cost[i0 - 1]
+            delta = INF
+            j1 = -1
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                reduced = row_cost[j - 1] - u[i0] - v[j]
+                if reduced < minv[j]:
+                    minv[j] = reduced
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            if j1 < 0 or delta == INF:
+                raise ValueError("hungarian: não existe atribuição com custo finito")
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # Inverte o caminho de aumento
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    assignment = [-1] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            assignment[match[j] - 1] = j - 1
+    return assignment
@@ -78,6 +78,75 @@ def calculate_edge_cost(
     return custo_total * distance
 
 
+def calculate_edge_cost_lower_bound(
+    distance: float,
+    time: float,
+    vehicle_type: Optional[VehicleType] = None,
+) -> float:
+    """
+    Limite inferior de calculate_edge_cost que não depende do estado do veículo.
+
+    Para elétricos, combustão e sem veículo é o próprio custo. Para híbridos o
+    custo depende da bateria atual, por isso usa a energia mais barata por km
+    e emissões nulas.
+
+    Args:
+        distance: Distância da aresta em metros
+        time: Tempo da aresta em minutos
+        vehicle_type: Tipo de veículo (opcional)
+
+    Returns:
+        float: Custo unificado mínimo da aresta
+    """
+    if not isinstance(vehicle_type, Hybrid):
+        return calculate_edge_cost(distance, time, vehicle_type)
+
+    dist_km = distance / 1000.0
+    custo_km = min(vehicle_type.battery_consumption / 100.0 * PRECO_BATERIA,
+                   vehicle_type.fuel_consumption / 100.0 * PRECO_COMBUSTIVEL)
+    custo_euros = custo_km * dist_km
+    custo_normalizado = custo_euros / CUSTO_BASE_EUR if CUSTO_BASE_EUR > 0 else custo_euros
+    return (PESO_TEMPO * time + PESO_CUSTO * custo_normalizado) * distance
+
+
+def cost_profile_key(vehicle_type: Optional[VehicleType]):
+    """
+    Chave que identifica os custos estáticos de um veículo.
+    Veículos com o mesmo tipo e consumos partilham as mesmas tabelas de custos.
+    """
+    if vehicle_type is None:
+        return None
+    if isinstance(vehicle_type, Eletric):
+        return ('Eletric', vehicle_type.battery_consumption)
+    if isinstance(vehicle_type, Combustion):
+        return ('Combustion', vehicle_type.fuel_consumption)
+    if isinstance(vehicle_type, Hybrid):
+        return ('Hybrid', vehicle_type.battery_consumption, vehicle_type.fuel_consumption)
+    return (type(vehicle_type).__name__,)
+
+
+def has_static_edge_costs(vehicle_type: Optional[VehicleType], max_edge_km: float) -> bool:
+    """
+    Indica se calculate_edge_cost depende apenas da aresta e do perfil do veículo.
+
+    Elétricos, combustão e sem veículo têm sempre custos estáticos. Os híbridos
+    só os têm quando a bateria atual chega para a maior aresta do grafo (todas
+    as arestas são feitas a bateria); caso contrário o custo muda com a bateria.
+
+    Args:
+        vehicle_type: Tipo de veículo (opcional)
+        max_edge_km: Comprimento da maior aresta do grafo em quilómetros
+
+    Returns:
+        bool: True se os custos podem ser pré-calculados por perfil
+    """
+    if isinstance(vehicle_type, Hybrid):
+        consumption = vehicle_type.battery_consumption / 100.0
+        battery_km = vehicle_type.current_battery / consumption if consumption > 0 else 0
+        return battery_km >= max_edge_km
+    return True
+
+
 def _calculate_operational_cost(dist_km: float, vehicle_type: Optional[VehicleType]) -> float:
     """
     Calcula o custo operacional em euros para uma distância.
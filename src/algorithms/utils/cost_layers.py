@@ -0,0 +1,145 @@
+"""
+Camadas de custos: custo unificado das arestas pré-calculado por perfil de veículo.
+
+Para elétricos, combustão e sem veículo (e híbridos com bateria para a maior
+aresta) calculate_edge_cost só depende da distância, do tempo atual e dos
+consumos do veículo. Em vez de o calcular em cada relaxação, a camada guarda-o
+num array por perfil (ver cost_profile_key), no mesmo formato CSR do
+graph.csr_graph e só com as arestas abertas, pela ordem de graph.neighbors.
+
+Cada camada regista o epoch do grafo com que foi calculada. Quando o
+EventManager altera tempos ou fecha estradas o epoch muda e a camada é
+recalculada na próxima procura. Mudanças de topologia (add_node/add_edge)
+descartam todas as camadas. Os veículos sem custos estáticos continuam a
+calcular o custo de cada aresta no momento.
+"""
+from array import array
+from typing import Callable, Iterable, Optional, Tuple
+
+from graph.graph import Graph
+from algorithms.utils.cost_function import calculate_edge_cost, cost_profile_key, has_static_edge_costs
+from vehicle.vehicle_types import VehicleType
+
+
+class CostLayer:
+    """
+    Custos unificados das arestas abertas para um perfil e um epoch.
+
+    Attributes:
+        epoch: Epoch do grafo com que os custos foram calculados
+        offsets: Arestas do nó u ocupam [offsets[u], offsets[u + 1])
+        targets: Nó de destino de cada aresta
+        costs: Custo unificado de cada aresta
+    """
+
+    def __init__(self, epoch: int, offsets: array, targets: array, costs: array) -> None:
+        self.epoch = epoch
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self.reverse: Optional['CostLayer'] = None  # Arestas de entrada, construído a pedido
+
+    def successors(self, node_id: int) -> Iterable[Tuple[int, float]]:
+        """(destino, custo) das arestas abertas que saem do nó."""
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        return zip(self.targets[start:end], self.costs[start:end])
+
+
+class CostLayerCache:
+    """
+    Camadas de um grafo, uma por perfil de custo.
+
+    Attributes:
+        layers: Dicionário cost_profile_key -> CostLayer
+        max_edge_km: Comprimento da maior aresta (para saber quando um híbrido
+                     tem custos estáticos)
+    """
+
+    def __init__(self, graph: Graph) -> None:
+        self.layers = {}
+        max_distance = 0.0
+        for edges in graph.edges.values():
+            for edge in edges:
+                max_distance = max(max_distance, edge["distance"])
+        self.max_edge_km = max_distance / 1000.0
+
+
+def get_cost_layer(graph: Graph, vehicle_type: Optional[VehicleType] = None) -> Optional[CostLayer]:
+    """
+    Retorna a camada de custos do veículo no epoch atual do grafo, calculando-a
+    se ainda não existe ou se os eventos mudaram as arestas.
+
+    Args:
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo
+
+    Returns:
+        CostLayer, ou None se os custos do veículo não são estáticos
+    """
+    cache = graph._cost_layers
+    if cache is None:
+        cache = graph._cost_layers = CostLayerCache(graph)
+    if not has_static_edge_costs(vehicle_type, cache.max_edge_km):
+        return None
+    key = cost_profile_key(vehicle_type)
+    layer = cache.layers.get(key)
+    if layer is None or layer.epoch != graph.epoch:
+        layer = build_cost_layer(graph, vehicle_type)
+        cache.layers[key] = layer
+    return layer
+
+
+def build_cost_layer(graph: Graph, vehicle_type: Optional[VehicleType] = None,
+                     reverse: bool = False) -> CostLayer:
+    """
+    Calcula o custo unificado de todas as arestas abertas.
+
+    Args:
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo (define o custo das arestas)
+        reverse: Se True, agrupa as arestas pelo nó de destino (graph.predecessors)
+
+    Returns:
+        CostLayer
+    """
+    expand = graph.predecessors if reverse else graph.neighbors
+    offsets = array('q', [0])
+    targets = array('i')
+    costs = array('d')
+    for node_id in range(len(graph.nodes)):
+        for other, edge_distance, edge_time in expand(node_id):
+            targets.append(other)
+            costs.append(calculate_edge_cost(edge_distance, edge_time, vehicle_type))
+        offsets.append(len(targets))
+    return CostLayer(graph.epoch, offsets, targets, costs)
+
+
+def weighted_neighbors(graph: Graph, vehicle_type: Optional[VehicleType] = None,
+                       reverse: bool = False) -> Callable[[int], Iterable[Tuple[int, float]]]:
+    """
+    Função de expansão das procuras com custo unificado: node_id -> [(vizinho, custo)].
+
+    Usa a camada de custos quando o veículo tem custos estáticos; caso contrário
+    calcula o custo de cada aresta aberta no momento.
+
+    Args:
+        graph: Grafo com o mapa
+        vehicle_type: Tipo de veículo
+        reverse: Se True, expande as arestas de entrada (procuras para trás)
+
+    Returns:
+        Callable[[int], Iterable[Tuple[int, float]]]
+    """
+    layer = get_cost_layer(graph, vehicle_type)
+    if layer is not None:
+        if reverse:
+            if layer.reverse is None:
+                layer.reverse = build_cost_layer(graph, vehicle_type, reverse=True)
+            layer = layer.reverse
+        return layer.successors
+
+    expand = graph.predecessors if reverse else graph.neighbors
+    return lambda node_id: [
+        (other, calculate_edge_cost(edge_distance, edge_time, vehicle_type))
+        for other, edge_distance, edge_time in expand(node_id)
+    ]
@@ -0,0 +1,238 @@
+"""
+Matrizes de custos many-to-many (origens × destinos) sobre o grafo.
+
+Cada linha/coluna é obtida com uma procura one-to-many (ver
+algorithms.uninformed.one_to_many) em vez de uma procura por par. As procuras
+partem do lado com menos nós: com menos destinos do que origens corre um
+Dijkstra invertido a partir de cada destino. Os IDs repetidos são removidos
+antes de procurar.
+
+Com muitas procuras (MATRIX_PARALLEL_MIN_SEARCHES) o trabalho é dividido por
+processos de um pool mantido entre chamadas; o grafo é enviado uma vez para
+cada processo e o pool só é recriado quando o grafo ou o seu epoch mudam. As tabelas são
+array('d') em ordem de linha (origem × destino); to_numpy() converte-as se o
+NumPy estiver instalado.
+"""
+from array import array
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+import os
+
+from graph.graph import Graph
+from algorithms.uninformed.one_to_many import one_to_many, ShortestPathTree
+from vehicle.vehicle_types import VehicleType
+
+# Constantes importadas do config
+try:
+    from config import MATRIX_WORKERS, MATRIX_PARALLEL_MIN_SEARCHES
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from config import MATRIX_WORKERS, MATRIX_PARALLEL_MIN_SEARCHES
+
+INF = float('inf')
+
+TABLES = ('distance', 'time', 'cost')
+
+
+class DistanceMatrix:
+    """
+    Tabelas de distância (m), tempo (min) e custo unificado entre origens e destinos.
+
+    Os valores de cada par são os do caminho de custo mínimo na métrica pedida
+    (inf se não existe caminho).
+
+    Attributes:
+        sources: IDs das origens (sem repetidos, pela ordem original)
+        targets: IDs dos destinos (sem repetidos, pela ordem original)
+        metric: Métrica usada para escolher os caminhos
+        distance / time / cost: array('d') com len(sources) * len(targets) valores
+    """
+
+    def __init__(self, sources: List[int], targets: List[int], metric: str,
+                 distance: array, time: array, cost: array,
+                 trees: Optional[dict] = None, reverse: bool = False) -> None:
+        self.sources = sources
+        self.targets = targets
+        self.metric = metric
+        self.distance = distance
+        self.time = time
+        self.cost = cost
+        self.source_index = {node_id: i for i, node_id in enumerate(sources)}
+        self.target_index = {node_id: j for j, node_id in enumerate(targets)}
+        self._trees = trees
+        self._reverse = reverse
+
+    def __contains__(self, pair: Tuple[int, int]) -> bool:
+        source, target = pair
+        return source in self.source_index and target in self.target_index
+
+    def _position(self, source: int, target: int) -> int:
+        return self.source_index[source] * len(self.targets) + self.target_index[target]
+
+    def lookup(self, source: int, target: int) -> Tuple[float, float, float]:
+        """
+        Returns:
+            Tuple[float, float, float]: (distância, tempo, custo unificado) de source até target
+        """
+        i = self._position(source, target)
+        return self.distance[i], self.time[i], self.cost[i]
+
+    def row(self, table: str, source: int) -> array:
+        """Valores de uma tabela ('distance', 'time' ou 'cost') de uma origem para todos os destinos."""
+        start = self.source_index[source] * len(self.targets)
+        return getattr(self, _table_name(table))[start:start + len(self.targets)]
+
+    def path(self, source: int, target: int) -> List[int]:
+        """
+        Caminho de source até target (só se a matriz foi criada com keep_paths=True).
+        """
+        if self._trees is None:
+            raise ValueError("Matriz criada sem caminhos (use keep_paths=True)")
+        if self._reverse:
+            return self._trees[target].path(source)
+        return self._trees[source].path(target)
+
+    def to_numpy(self, table: str = 'cost'):
+        """Tabela como numpy.ndarray (len(sources) × len(targets)). Requer NumPy."""
+        import numpy as np
+        values = getattr(self, _table_name(table))
+        return np.frombuffer(values, dtype=np.float64).reshape(len(self.sources), len(self.targets)).copy()
+
+
+def distance_matrix(sources: Iterable[int], targets: Iterable[int], graph: Graph,
+                    metric: str = 'cost', vehicle_type: Optional[VehicleType] = None,
+                    workers: Optional[int] = MATRIX_WORKERS, keep_paths: bool = False) -> DistanceMatrix:
+    """
+    Calcula a matriz de custos entre dois conjuntos de nós.
+
+    Args:
+        sources: IDs dos nós de origem
+        targets: IDs dos nós de destino
+        graph: Grafo com o mapa
+        metric: Métrica dos caminhos ('distance', 'time' ou 'cost')
+        vehicle_type: Tipo de veículo (para o custo unificado)
+        workers: Nº de processos (None = nº de CPUs, 1 = sem paralelismo); só
+                 usado com pelo menos MATRIX_PARALLEL_MIN_SEARCHES procuras.
+                 O pool fica ativo para as chamadas seguintes sobre o mesmo
+                 grafo (ver shutdown_matrix_pool)
+        keep_paths: Guarda as árvores de procura para permitir path()
+
+    Returns:
+        DistanceMatrix
+    """
+    sources = list(dict.fromkeys(sources))
+    targets = list(dict.fromkeys(targets))
+
+    # Procura a partir do lado mais pequeno
+    reverse = len(targets) < len(sources)
+    roots, others = (targets, sources) if reverse else (sources, targets)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(roots) >= MATRIX_PARALLEL_MIN_SEARCHES:
+        chunk_size = max(1, len(roots) // (workers * 4))
+        chunks = [roots[i:i + chunk_size] for i in range(0, len(roots), chunk_size)]
+        executor = _get_pool(graph, workers)
+        results = []
+        try:
+            for chunk_results in executor.map(_worker_searches, chunks,
+                                              [(others, metric, vehicle_type, reverse, keep_paths)] * len(chunks)):
+                results.extend(chunk_results)
+        except Exception:
+            # Um processo que falhou deixa o pool inutilizável: o próximo pedido cria outro
+            shutdown_matrix_pool()
+            raise
+    else:
+        results = _run_searches(graph, roots, others, metric, vehicle_type, reverse, keep_paths)
+
+    # Monta as tabelas em ordem origem × destino
+    n_sources, n_targets = len(sources), len(targets)
+    distance = array('d', [INF]) * (n_sources * n_targets)
+    time = array('d', [INF]) * (n_sources * n_targets)
+    cost = array('d', [INF]) * (n_sources * n_targets)
+    trees = {} if keep_paths else None
+    for k, (root, row_distance, row_time, row_cost, tree) in enumerate(results):
+        if keep_paths:
+            trees[root] = tree
+        for m in range(len(others)):
+            i = m * n_targets + k if reverse else k * n_targets + m
+            distance[i] = row_distance[m]
+            time[i] = row_time[m]
+            cost[i] = row_cost[m]
+
+    return DistanceMatrix(sources, targets, metric, distance, time, cost, trees, reverse)
+
+
+def _run_searches(graph: Graph, roots: List[int], others: List[int], metric: str,
+                  vehicle_type: Optional[VehicleType], reverse: bool, keep_paths: bool) -> list:
+    """Uma procura por raiz; devolve (raiz, distâncias, tempos, custos, árvore ou None)."""
+    results = []
+    other_set = set(others)
+    for root in roots:
+        tree = one_to_many(root, graph, targets=other_set, metric=metric, vehicle_type=vehicle_type,
+                           reverse=reverse, track_unified_cost=True)
+        row_distance = array('d', [INF]) * len(others)
+        row_time = array('d', [INF]) * len(others)
+        row_cost = array('d', [INF]) * len(others)
+        for m, node_id in enumerate(others):
+            if tree.reached(node_id):
+                row_distance[m] = tree.distance[node_id]
+                row_time[m] = tree.time[node_id]
+                row_cost[m] = tree.unified_cost[node_id]
+        results.append((root, row_distance, row_time, row_cost, tree if keep_paths else None))
+    return results
+
+
+# Pool de processos reutilizado entre chamadas, com o grafo enviado uma vez pelo
+# initializer. É recriado quando muda o grafo, o seu epoch (os processos têm uma
+# cópia com os tempos antigos) ou o nº de processos.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_graph: Optional[Graph] = None
+_pool_key: Optional[Tuple[int, int]] = None
+
+
+def _get_pool(graph: Graph, workers: int) -> ProcessPoolExecutor:
+    """Retorna o pool de processos para o grafo no epoch atual, criando-o se preciso."""
+    global _pool, _pool_graph, _pool_key
+    key = (graph.epoch, workers)
+    if _pool is None or _pool_graph is not graph or _pool_key != key:
+        shutdown_matrix_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph,))
+        _pool_graph = graph
+        _pool_key = key
+    return _pool
+
+
+def shutdown_matrix_pool() -> None:
+    """Termina o pool de processos das matrizes (é recriado no próximo cálculo paralelo)."""
+    global _pool, _pool_graph, _pool_key
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+    _pool = None
+    _pool_graph = None
+    _pool_key = None
+
+
+atexit.register(shutdown_matrix_pool)
+
+
+# Grafo de cada processo (enviado uma vez pelo initializer)
+_worker_graph: Optional[Graph] = None
+
+
+def _init_worker(graph: Graph) -> None:
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _worker_searches(roots: List[int], args: tuple) -> list:
+    others, metric, vehicle_type, reverse, keep_paths = args
+    return _run_searches(_worker_graph, roots, others, metric, vehicle_type, reverse, keep_paths)
+
+
+def _table_name(table: str) -> str:
+    if table not in TABLES:
+        raise ValueError(f"Tabela desconhecida '{table}' (use uma de {TABLES})")
+    return table
@@ -0,0 +1,24 @@
+"""
+Reconstrução de caminhos a partir de apontadores para o nó anterior.
+"""
+from typing import Dict, List, Optional
+
+
+def reconstruct_path(came_from: Dict[int, Optional[int]], goal_id: int) -> List[int]:
+    """
+    Segue os apontadores desde o objetivo até à origem.
+
+    Args:
+        came_from: Dicionário nó -> nó anterior (a origem aponta para None ou não tem entrada)
+        goal_id: ID do nó objetivo
+
+    Returns:
+        List[int]: Caminho da origem até ao objetivo
+    """
+    path = [goal_id]
+    parent = came_from.get(goal_id)
+    while parent is not None:
+        path.append(parent)
+        parent = came_from.get(parent)
+    path.reverse()
+    return path
@@ -0,0 +1,111 @@
+"""
+Área de trabalho reutilizável para as procuras (g-score, nó anterior, estado).
+
+Em vez de criar dicionários com todos os nós do grafo em cada procura, as
+procuras usam arrays pré-alocados do tamanho do grafo e um carimbo de geração
+por nó: uma entrada só é válida se o seu carimbo é igual à geração atual.
+Começar uma nova procura é apenas incrementar a geração, pelo que o custo de
+uma procura é proporcional aos nós que explora e não ao tamanho do grafo.
+"""
+from array import array
+from contextlib import contextmanager
+from typing import Iterator, List
+
+INF = float('inf')
+NO_PARENT = -1
+
+# Carimbos são 'L' (pelo menos 32 bits); ao chegar ao limite os carimbos são limpos
+_MAX_GENERATION = 2 ** 32 - 1
+
+
+class SearchWorkspace:
+    """
+    Arrays indexados pelo ID do nó, válidos apenas na geração atual.
+
+    Attributes:
+        g: Custo acumulado g(n)
+        parent: Nó anterior no caminho (NO_PARENT na origem)
+        state: Estado livre para o algoritmo (p.ex. 1 = na fila, 2 = visitado)
+        stamp: Geração em que a entrada foi escrita
+        generation: Geração da procura atual
+    """
+
+    def __init__(self, size: int = 0) -> None:
+        self.size = 0
+        self.generation = 0
+        self.g = array('d')
+        self.parent = array('i')
+        self.state = bytearray()
+        self.stamp = array('L')
+        self.in_use = False
+        self._grow(size)
+
+    def _grow(self, size: int) -> None:
+        extra = size - self.size
+        if extra > 0:
+            self.g.extend(array('d', [INF]) * extra)
+            self.parent.extend(array('i', [NO_PARENT]) * extra)
+            self.state.extend(bytes(extra))
+            self.stamp.extend(array('L', [0]) * extra)
+            self.size = size
+
+    def begin(self, size: int) -> None:
+        """
+        Prepara a área para uma nova procura num grafo com size nós.
+        Todas as entradas passam a inválidas (g = inf, sem anterior, estado 0).
+        """
+        self._grow(size)
+        self.generation += 1
+        if self.generation >= _MAX_GENERATION:
+            self.stamp = array('L', [0]) * self.size
+            self.generation = 1
+
+    def touched(self, node_id: int) -> bool:
+        """Indica se o nó foi escrito na procura atual."""
+        return self.stamp[node_id] == self.generation
+
+    def g_of(self, node_id: int) -> float:
+        """g(n) na procura atual (inf se o nó ainda não foi alcançado)."""
+        return self.g[node_id] if self.stamp[node_id] == self.generation else INF
+
+    def set(self, node_id: int, g: float, parent: int = NO_PARENT, state: int = 0) -> None:
+        """Escreve a entrada de um nó na procura atual."""
+        self.stamp[node_id] = self.generation
+        self.g[node_id] = g
+        self.parent[node_id] = parent
+        self.state[node_id] = state
+
+    def path_to(self, node_id: int) -> List[int]:
+        """Caminho da origem até ao nó, seguindo os nós anteriores."""
+        path = [node_id]
+        parent = self.parent
+        current = parent[node_id]
+        while current != NO_PARENT:
+            path.append(current)
+            current = parent[current]
+        path.reverse()
+        return path
+
+
+@contextmanager
+def search_workspace(graph) -> Iterator[SearchWorkspace]:
+    """
+    Empresta a área de trabalho do grafo, já preparada para uma nova procura.
+
+    A área fica guardada no grafo e é reutilizada entre procuras. Se já estiver
+    em uso (procura dentro de outra procura) é criada uma área temporária.
+
+    Args:
+        graph: Grafo onde vai decorrer a procura
+    """
+    workspace = graph._search_workspace
+    if workspace is None:
+        workspace = graph._search_workspace = SearchWorkspace()
+    elif workspace.in_use:
+        workspace = SearchWorkspace()
+    workspace.begin(len(graph.nodes))
+    workspace.in_use = True
+    try:
+        yield workspace
+    finally:
+        workspace.in_use = False
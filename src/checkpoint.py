@@ -0,0 +1,104 @@
+"""
+Checkpoints de uma simulação em curso.
+
+Guarda o estado completo de uma Simulation (relógio, estatísticas, veículos a
+meio de uma aresta com time_remaining_on_edge, pedidos, fila de pedidos e
+tempos das arestas já alterados pelo EventManager) num ficheiro compacto:
+um cabeçalho com a versão do formato seguido de um pickle comprimido com zlib.
+
+O checkpoint pode ser carregado noutro processo e a simulação continua
+exatamente onde parou. Ao carregar é possível mudar o algoritmo, a heurística
+ou o modo de despacho, para experimentar várias variantes a partir do mesmo
+estado a meio do dia (por exemplo em paralelo com um ProcessPoolExecutor, a
+partir dos bytes de dumps_checkpoint) sem voltar a simular a manhã.
+"""
+import os
+import pickle
+import struct
+import zlib
+
+CHECKPOINT_MAGIC = b'UBCK'
+CHECKPOINT_VERSION = 1  # Incrementar quando o estado da Simulation mudar de forma incompatível
+_HEADER = struct.Struct('<4sI')
+
+
+def dumps_checkpoint(simulation) -> bytes:
+    """
+    Serializa o estado completo da simulação.
+
+    Args:
+        simulation: Simulation (ou DiscreteEventSimulation) em curso
+
+    Returns:
+        bytes: Cabeçalho + pickle comprimido
+    """
+    payload = pickle.dumps(simulation, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION) + zlib.compress(payload)
+
+
+def loads_checkpoint(data: bytes, search_algorithm=None, heuristic=None, dispatch_mode=None):
+    """
+    Recria uma simulação a partir de dumps_checkpoint.
+
+    Args:
+        data: Bytes do checkpoint
+        search_algorithm: Outro algoritmo de procura a usar daqui em diante (opcional)
+        heuristic: Outra heurística (opcional; só com search_algorithm ou em algoritmos informados)
+        dispatch_mode: Outro modo de despacho (opcional)
+
+    Returns:
+        Simulation pronta a continuar com step()
+
+    Raises:
+        ValueError: Se os dados não são um checkpoint desta versão
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Checkpoint inválido (ficheiro truncado)")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("Checkpoint inválido (não é um checkpoint de simulação)")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint da versão {version} (esperada {CHECKPOINT_VERSION})")
+    simulation = pickle.loads(zlib.decompress(data[_HEADER.size:]))
+
+    if dispatch_mode is not None:
+        if dispatch_mode not in simulation.DISPATCH_MODES:
+            raise ValueError(f"Modo de despacho desconhecido '{dispatch_mode}' (use um de {simulation.DISPATCH_MODES})")
+        simulation.dispatch_mode = dispatch_mode
+    if search_algorithm is not None or heuristic is not None:
+        simulation.set_search_algorithm(
+            search_algorithm if search_algorithm is not None else simulation.search_algorithm_func,
+            heuristic if heuristic is not None else simulation.heuristic
+        )
+    return simulation
+
+
+def save_checkpoint(simulation, path: str) -> None:
+    """
+    Guarda o checkpoint num ficheiro (escrita atómica para não deixar ficheiros parciais).
+
+    Args:
+        simulation: Simulation em curso
+        path: Caminho do ficheiro
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps_checkpoint(simulation))
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str, search_algorithm=None, heuristic=None, dispatch_mode=None):
+    """
+    Carrega um checkpoint guardado por save_checkpoint (ver loads_checkpoint).
+
+    Args:
+        path: Caminho do ficheiro
+        search_algorithm, heuristic, dispatch_mode: Alterações opcionais para a continuação
+
+    Returns:
+        Simulation pronta a continuar com step()
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return loads_checkpoint(data, search_algorithm=search_algorithm, heuristic=heuristic,
+                            dispatch_mode=dispatch_mode)
@@ -10,12 +10,23 @@ SIMULATION_START_TIME = 8 * 60   # 08:00 em minutos
 SIMULATION_END_TIME = 20 * 60    # 20:00 em minutos
 DEFAULT_TIME_STEP = 1            # Minutos por tick
 EVENT_UPDATE_INTERVAL = 30       # Intervalo em minutos para atualizar eventos
+DISPATCH_MODE = "per_vehicle"    # "per_vehicle" (procura por veículo), "one_to_many" (Dijkstra único a partir do pickup) ou "batch" (atribuição ótima por tick)
+DISPATCH_CANDIDATES = 8          # Nº de veículos livres mais próximos avaliados por pedido (0 = todos)
+BATCH_PREMIUM_WEIGHT = 2.0       # Peso dos pedidos premium no despacho em lote
+BATCH_UNASSIGNED_PENALTY = 1000.0  # Custo (minutos) de deixar um pedido sem veículo no despacho em lote
+SIMULATION_WORKERS = None        # Processos para "Executar TODOS os algoritmos" (None = nº de CPUs, 1 = sequencial)
+SIMULATION_ENGINE = "tick"       # Modo sem visualização: "tick" (minuto a minuto) ou "event" (eventos discretos, igual a ticks de 1 minuto)
 
 # =============================================================================
 # GRAFO E ESCALA
 # =============================================================================
 SCALE_FACTOR = 15                # Fator de escala para simular área maior
 DEFAULT_EDGE_SPEED_KMH = 50      # Velocidade padrão das arestas em km/h
+GRAPH_BACKEND = "dict"           # "dict" (listas de dicionários) ou "csr" (colunas compactas)
+GRAPH_CACHE_ENABLED = True       # Guarda o grafo gerado a partir do OSM numa cache local
+GRAPH_CACHE_DIR = "data/cache"   # Pasta da cache (relativa à raiz do projeto)
+GRAPH_CACHE_VERSION = 1          # Incrementar quando o formato/construção do grafo mudar
+GRAPH_CACHE_FORMAT = "pickle"    # "pickle" ou "binary" (ficheiro mapeado com mmap, partilhado entre processos)
 
 # =============================================================================
 # PREÇOS DE ENERGIA
@@ -62,6 +73,19 @@ EMISSOES_BASE_G = 60.0           # ~60g CO₂/km (média considerando mix de ve
 DEFAULT_SPEED_KMH = 50.0         # Velocidade média padrão
 COST_PER_KM = 0.50               # Custo por km (fallback)
 COST_PER_MIN = 0.20              # Custo por minuto (fallback)
+ALT_NUM_LANDMARKS = 8            # Nº de landmarks da heurística 'landmarks' (ALT)
+
+# =============================================================================
+# MATRIZES DE CUSTOS (MANY-TO-MANY)
+# =============================================================================
+MATRIX_WORKERS = None            # Processos para matrizes grandes (None = nº de CPUs, 1 = sem paralelismo)
+MATRIX_PARALLEL_MIN_SEARCHES = 64  # Nº mínimo de procuras para usar processos
+
+# =============================================================================
+# CACHE DE ROTAS
+# =============================================================================
+ROUTE_CACHE_MAX_ENTRIES = 4096   # Nº máximo de rotas guardadas (0 = sem cache)
+ROUTE_CACHE_MAX_PATH_NODES = 500000  # Nº máximo de nós somando todos os caminhos guardados
 
 # =============================================================================
 # PENALIZAÇÕES DE TRÂNSITO (HEURÍSTICA TRAFFIC_AVOIDANCE)
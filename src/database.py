@@ -1,10 +1,12 @@
 import json
 
 from graph.position import Position
+from graph.csr_graph import CSRGraph
 from location import create_location_graph
 from vehicle import Vehicle, Eletric, Combustion, Hybrid, Vehicle_Status
 from request import Request
 from events import load_events_from_config
+from config import GRAPH_BACKEND
 
 
 
@@ -19,6 +21,60 @@ class Database:
         self.charging_stations = charging_stations if charging_stations is not None else []
         self.event_manager = event_manager
 
+    def snapshot(self):
+        '''
+        Captures the mutable state of the simulation data: edge times and open flags,
+        vehicle energy, position and trip state, request status and closed roads.
+        The graph topology, nodes and stations are shared, not copied.
+
+        :return: A DatabaseSnapshot to pass to restore()
+        '''
+        return DatabaseSnapshot(self)
+
+    def restore(self, snapshot):
+        '''
+        Puts the database back in the state captured by snapshot(), without reloading
+        the dataset. The same snapshot can be restored any number of times.
+
+        :param snapshot: A DatabaseSnapshot taken from this database
+        '''
+        snapshot.apply(self)
+
+
+class DatabaseSnapshot:
+    '''
+    Mutable state of a Database at a given moment (see Database.snapshot)
+    '''
+    def __init__(self, database):
+        self.edge_state = database.graph.edge_state()
+        self.vehicles = [
+            (vehicle, _copy_state(vehicle.__dict__), dict(vehicle.vehicle_type.__dict__))
+            for vehicle in database.vehicles
+        ]
+        self.requests = [(request, _copy_state(request.__dict__)) for request in database.requests]
+        event_manager = database.event_manager
+        self.closed_roads = list(event_manager.closed_roads) if event_manager else None
+
+    def apply(self, database):
+        database.graph.restore_edge_state(self.edge_state)
+        for vehicle, state, type_state in self.vehicles:
+            vehicle.__dict__.clear()
+            vehicle.__dict__.update(_copy_state(state))
+            vehicle.vehicle_type.__dict__.clear()
+            vehicle.vehicle_type.__dict__.update(type_state)
+        for request, state in self.requests:
+            request.__dict__.clear()
+            request.__dict__.update(_copy_state(state))
+        database.vehicles = [vehicle for vehicle, _, _ in self.vehicles]
+        database.requests = [request for request, _ in self.requests]
+        if database.event_manager and self.closed_roads is not None:
+            database.event_manager.closed_roads = list(self.closed_roads)
+
+
+def _copy_state(state):
+    # Lists (planned paths) are changed in place during the simulation
+    return {key: list(value) if isinstance(value, list) else value for key, value in state.items()}
+
 def get_position_from_node_id(graph, node_id: int) -> Position:
     node = graph.get_node(node_id)
     if node is None:
@@ -38,6 +94,8 @@ def load_dataset(dataset_path) -> Database:
 
     location = dataset['location']
     graph = create_location_graph(location)
+    if GRAPH_BACKEND == "csr" and not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_graph(graph)
 
     vehicles = []
 
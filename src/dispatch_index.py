@@ -0,0 +1,109 @@
+"""
+Índice espacial dos veículos livres para o despacho.
+
+Em vez de percorrer a frota inteira e calcular rotas para todos os veículos
+livres, o despacho pede ao índice os k veículos elegíveis mais próximos do
+pickup (em linha reta). Os veículos livres ficam numa grelha (GridIndex) por
+classe de veículo — elétrico ou não e capacidade — para que os filtros de
+preferência ecológica e de nº de passageiros não obriguem a percorrer
+veículos que nunca seriam escolhidos.
+
+O índice é atualizado pelas transições de estado dos veículos (ver
+Vehicle.status_listener): um veículo entra quando fica IDLE e sai quando
+deixa de o estar.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from graph.spatial_index import GridIndex
+from vehicle.vehicle import Vehicle, Vehicle_Status
+from vehicle.vehicle_types import Eletric
+
+
+class IdleVehicleIndex:
+    """
+    Veículos livres agrupados por classe (elétrico, capacidade) e por célula.
+
+    Os veículos são identificados pela posição na frota, que também desempata
+    distâncias iguais e define a ordem devolvida (a mesma da frota).
+
+    Attributes:
+        vehicles: Frota completa (lista da Database)
+        cell_size: Lado das células da grelha em metros
+        fleet_index: Posição de cada veículo na frota
+    """
+
+    def __init__(self, vehicles: List[Vehicle], cell_size: float) -> None:
+        self.vehicles = vehicles
+        self.cell_size = cell_size
+        self.fleet_index: Dict[Vehicle, int] = {v: i for i, v in enumerate(vehicles)}
+        self._grids: Dict[Tuple[bool, int], GridIndex] = {}
+        self._vehicle_class: Dict[int, Tuple[bool, int]] = {}
+        for vehicle in vehicles:
+            if vehicle.status == Vehicle_Status.IDLE:
+                self.add(vehicle)
+
+    def __len__(self) -> int:
+        return len(self._vehicle_class)
+
+    def __contains__(self, vehicle: Vehicle) -> bool:
+        return self.fleet_index.get(vehicle) in self._vehicle_class
+
+    @staticmethod
+    def vehicle_class(vehicle: Vehicle) -> Tuple[bool, int]:
+        """Classe do veículo no índice: (é elétrico, capacidade)."""
+        return isinstance(vehicle.vehicle_type, Eletric), vehicle.capacity
+
+    def add(self, vehicle: Vehicle) -> None:
+        """Adiciona um veículo livre na sua posição atual."""
+        index = self.fleet_index[vehicle]
+        if index in self._vehicle_class:
+            return
+        vehicle_class = self.vehicle_class(vehicle)
+        grid = self._grids.get(vehicle_class)
+        if grid is None:
+            grid = self._grids[vehicle_class] = GridIndex(self.cell_size)
+        grid.insert(index, vehicle.current_position.x, vehicle.current_position.y)
+        self._vehicle_class[index] = vehicle_class
+
+    def remove(self, vehicle: Vehicle) -> None:
+        """Remove um veículo (deixou de estar livre)."""
+        index = self.fleet_index[vehicle]
+        vehicle_class = self._vehicle_class.pop(index, None)
+        if vehicle_class is not None:
+            self._grids[vehicle_class].remove(index)
+
+    def on_status_change(self, vehicle: Vehicle, old_status: Vehicle_Status,
+                         new_status: Vehicle_Status) -> None:
+        """Listener das transições de estado dos veículos."""
+        if new_status == Vehicle_Status.IDLE:
+            self.add(vehicle)
+        elif old_status == Vehicle_Status.IDLE:
+            self.remove(vehicle)
+
+    def candidates(self, x: float, y: float, electric_only: bool = False, min_capacity: int = 0,
+                   limit: Optional[int] = None) -> List[Vehicle]:
+        """
+        Veículos livres elegíveis, os mais próximos de (x, y) primeiro a ser escolhidos.
+
+        Args:
+            x, y: Posição do pickup
+            electric_only: Apenas veículos elétricos (cliente eco-friendly)
+            min_capacity: Capacidade mínima (nº de passageiros)
+            limit: Nº máximo de veículos (None = todos os elegíveis)
+
+        Returns:
+            List[Vehicle]: Veículos escolhidos, pela ordem da frota
+        """
+        grids = [
+            grid for (electric, capacity), grid in self._grids.items()
+            if capacity >= min_capacity and (electric or not electric_only) and len(grid)
+        ]
+        if limit is None:
+            chosen = [index for grid in grids for index in grid.points]
+        else:
+            # Os k mais próximos de cada classe, e destes os k mais próximos no total
+            nearest = [pair for grid in grids for pair in grid.k_nearest(x, y, limit)]
+            nearest.sort()
+            chosen = [index for _, index in nearest[:limit]]
+        chosen.sort()
+        return [self.vehicles[index] for index in chosen]
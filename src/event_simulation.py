@@ -0,0 +1,220 @@
+"""
+Motor de simulação por eventos discretos.
+
+Em vez de avançar um minuto de cada vez e atualizar todos os veículos e
+pedidos em cada tick, o relógio salta diretamente para o minuto do próximo
+evento. Os eventos são guardados numa fila de prioridade:
+
+- chegada de pedidos (minuto em que o pedido passa a ser considerado)
+- fim da aresta atual de um veículo (ver Vehicle._process_travel)
+- fim de um abastecimento/recarga
+- atualização do clima/trânsito pelo EventManager (a cada EVENT_UPDATE_INTERVAL minutos)
+
+Dentro de cada minuto os eventos seguem a mesma ordem que Simulation.step
+(eventos do mapa, despacho, veículos), pelo que os resultados são iguais aos
+de uma simulação com ticks de 1 minuto. Os minutos de viagem entre eventos
+são aplicados ao veículo apenas quando o evento seguinte acontece (com os
+mesmos passos de 1 minuto, para o consumo de energia ser exatamente o mesmo).
+"""
+import heapq
+import math
+
+from simulation import Simulation
+from vehicle import Vehicle_Status
+
+# Constantes importadas do config
+try:
+    from config import DISPATCH_MODE, EVENT_UPDATE_INTERVAL
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from config import DISPATCH_MODE, EVENT_UPDATE_INTERVAL
+
+# Fases dentro de um minuto (mesma ordem que Simulation.step)
+PHASE_MAP_EVENTS = 0
+PHASE_DISPATCH = 1
+PHASE_VEHICLE = 2
+
+
+class DiscreteEventSimulation(Simulation):
+    """
+    Simulação equivalente a Simulation com time_step=1, movida por eventos.
+
+    O custo de uma simulação passa a ser proporcional ao número de eventos
+    (pedidos, arestas percorridas, abastecimentos) em vez de minutos × frota.
+    Os veículos em viagem só são atualizados quando chega o seu próximo evento;
+    a posição intermédia de um veículo numa aresta só fica atualizada nesse
+    momento (ou no fim da simulação), por isso este motor destina-se a
+    execuções sem visualização.
+    """
+
+    def __init__(self, database, search_algorithm, heuristic=None, dispatch_mode=DISPATCH_MODE):
+        """
+        Inicializa a simulação.
+
+        Args:
+            database: Database contendo veículos, grafo e requests
+            search_algorithm: Função de algoritmo de procura a usar
+            heuristic: Heurística a usar (para algoritmos informados)
+            dispatch_mode: Modo de despacho (ver Simulation.DISPATCH_MODES)
+        """
+        super().__init__(database, search_algorithm, time_step=1, heuristic=heuristic,
+                         dispatch_mode=dispatch_mode)
+        self._schedule_initial_events()
+
+    def _schedule_initial_events(self):
+        """Agenda chegadas de pedidos, atualizações do mapa e veículos já em movimento."""
+        self._queue = []                  # (minuto, fase, seq, veículo ou None)
+        self._seq = 0                     # Desempate entre eventos do mesmo minuto e fase
+        self._dispatch_minutes = set()    # Minutos com despacho já agendado
+        self._next_update = {}            # Veículo -> primeiro minuto ainda não aplicado
+        self._wake_minute = {}            # Veículo -> minuto do próximo evento do veículo
+        self.events_processed = 0
+
+        for request in self.requests:
+            if request.status == 'pending':
+                self._schedule_dispatch(max(self.current_time, math.ceil(request.requested_time)))
+
+        if self.db.event_manager:
+            first = -(-self.current_time // EVENT_UPDATE_INTERVAL) * EVENT_UPDATE_INTERVAL
+            for minute in range(first, self.end_time, EVENT_UPDATE_INTERVAL):
+                self._push(minute, PHASE_MAP_EVENTS)
+
+        for vehicle in self.vehicles:
+            self._schedule_vehicle(vehicle, self.current_time)
+
+    def _push(self, minute, phase, vehicle=None):
+        self._seq += 1
+        heapq.heappush(self._queue, (minute, phase, self._seq, vehicle))
+
+    def _schedule_dispatch(self, minute):
+        if minute < self.end_time and minute not in self._dispatch_minutes:
+            self._dispatch_minutes.add(minute)
+            self._push(minute, PHASE_DISPATCH)
+
+    def _schedule_vehicle(self, vehicle, first_minute):
+        """
+        Agenda o próximo evento de um veículo: o minuto em que a contagem da
+        aresta (ou do abastecimento) chega a zero, contando de 1 em 1 minuto a
+        partir de first_minute, como Vehicle.update_status faria em cada tick.
+        """
+        self._next_update[vehicle] = first_minute
+        self._wake_minute.pop(vehicle, None)
+
+        if vehicle.phase == 'refueling':
+            remaining = vehicle.refuel_time_remaining
+        elif (vehicle.status == Vehicle_Status.TRAVELING
+              and vehicle.current_edge_from is not None and vehicle.current_edge_to is not None):
+            remaining = vehicle.time_remaining_on_edge
+        else:
+            return
+
+        minute = first_minute
+        remaining -= 1
+        while remaining > 0:
+            remaining -= 1
+            minute += 1
+        if minute < self.end_time:
+            self._wake_minute[vehicle] = minute
+            self._push(minute, PHASE_VEHICLE, vehicle)
+
+    def _advance_vehicle(self, vehicle, until_minute):
+        """Aplica ao veículo os ticks de 1 minuto em falta até until_minute (inclusive)."""
+        for minute in range(self._next_update[vehicle], until_minute + 1):
+            vehicle.update_status(minute, 1)
+        self._next_update[vehicle] = until_minute + 1
+
+    # ========================================
+    # PROCESSAMENTO DOS EVENTOS
+    # ========================================
+
+    def _dispatch(self, minute):
+        """Despacho no minuto atual; reagenda os veículos que receberam pedidos."""
+        idle_before = [v for v in self.vehicles if v.status == Vehicle_Status.IDLE]
+        pending_before = self.request_counts['pending']
+
+        new_requests = self.process_new_requests()
+
+        for vehicle in idle_before:
+            if vehicle.status != Vehicle_Status.IDLE or vehicle.phase == 'refueling':
+                self._schedule_vehicle(vehicle, minute)
+
+        # Uma atribuição pode libertar logo um veículo (viagem sem arestas):
+        # os pedidos que ficaram por atribuir voltam a ser tentados no minuto seguinte
+        pending_after = self.request_counts['pending']
+        if pending_after and pending_after < pending_before:
+            self._schedule_dispatch(minute + 1)
+        return new_requests
+
+    def _wake_vehicle(self, vehicle, minute):
+        """Evento de fim de aresta ou de abastecimento de um veículo."""
+        if self._wake_minute.get(vehicle) != minute:
+            return  # Evento desatualizado
+        self._advance_vehicle(vehicle, minute)
+        if vehicle.status == Vehicle_Status.IDLE:
+            # Veículo livre: os pedidos pendentes voltam a ser tentados no minuto seguinte
+            self._schedule_dispatch(minute + 1)
+        self._schedule_vehicle(vehicle, minute + 1)
+
+    def step(self):
+        """
+        Processa todos os eventos do próximo minuto com eventos.
+
+        Returns:
+            dict: Informação sobre o passo executado
+        """
+        if self.is_finished():
+            return {'finished': True}
+
+        if not self._queue or self._queue[0][0] >= self.end_time:
+            self._finish()
+            return {'finished': True}
+
+        minute = self._queue[0][0]
+        self.current_time = minute
+        new_requests = 0
+        while self._queue and self._queue[0][0] == minute:
+            _, phase, _, vehicle = heapq.heappop(self._queue)
+            self.events_processed += 1
+            if phase == PHASE_MAP_EVENTS:
+                self.db.event_manager.apply_events_to_edges(minute)
+            elif phase == PHASE_DISPATCH:
+                new_requests = self._dispatch(minute)
+            else:
+                self._wake_vehicle(vehicle, minute)
+
+        self.update_statistics()
+        self.current_time = minute + 1
+
+        if not self._queue or self._queue[0][0] >= self.end_time:
+            self._finish()
+
+        return {
+            'finished': False,
+            'time': self.current_time,
+            'new_requests': new_requests,
+            'stats': self.stats.copy()
+        }
+
+    def run(self):
+        """Executa a simulação até ao fim e retorna as estatísticas."""
+        while not self.is_finished():
+            self.step()
+        return self.stats
+
+    def _finish(self):
+        """Aplica os minutos em falta a todos os veículos e fecha as estatísticas no último tick."""
+        last_minute = self.end_time - 1
+        for vehicle in self.vehicles:
+            self._advance_vehicle(vehicle, last_minute)
+        self._queue = []
+        self.current_time = last_minute
+        self.update_statistics()
+        self.stats['events_processed'] = self.events_processed
+        self.current_time = self.end_time
+
+    def reset(self):
+        """Reset da simulação para estado inicial."""
+        super().reset()
+        self._schedule_initial_events()
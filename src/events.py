@@ -131,21 +131,10 @@ class EventManager:
         Args:
             node_id1, node_id2: IDs dos nós conectados pela estrada
         """
-        # Marca a aresta como fechada no grafo
-        closed = False
-        
-        # Procura e fecha a aresta em ambas direções
-        if node_id1 in self.graph.edges:
-            for edge in self.graph.edges[node_id1]:
-                if edge['target'] == node_id2:
-                    edge['open'] = False
-                    closed = True
-        
-        if node_id2 in self.graph.edges:
-            for edge in self.graph.edges[node_id2]:
-                if edge['target'] == node_id1:
-                    edge['open'] = False
-                    closed = True
+        # Fecha a aresta em ambas direções (o grafo mantém o índice de arestas)
+        closed_forward = self.graph.set_edge_open(node_id1, node_id2, False)
+        closed_backward = self.graph.set_edge_open(node_id2, node_id1, False)
+        closed = closed_forward or closed_backward
         
         if closed:
             self.closed_roads.append((node_id1, node_id2))
@@ -244,6 +233,7 @@ class EventManager:
             current_time: Tempo atual em minutos (opcional, para verificar intervalos)
         """
         affected_edges = 0
+        changed = False
         
         for node_id, edges in self.graph.edges.items():
             # Obtém multiplicadores para este nó de origem
@@ -255,7 +245,10 @@ class EventManager:
                     edge['base_time'] = edge['time']
                 
                 # Aplica o multiplicador ao tempo base (ou restaura se multiplicador é 1.0)
-                edge['time'] = edge['base_time'] * combined_mult
+                new_time = edge['base_time'] * combined_mult
+                if edge['time'] != new_time:
+                    edge['time'] = new_time
+                    changed = True
                 
                 if combined_mult != 1.0:
                     edge['weather'] = self.get_weather_at_node(node_id, current_time).value
@@ -266,6 +259,10 @@ class EventManager:
                     edge['weather'] = 'clear'
                     edge['traffic'] = 'clear'
         
+        # Só muda de epoch se algum tempo mudou (as caches de custos continuam válidas)
+        if changed:
+            self.graph.mark_edges_changed()
+
         if affected_edges > 0:
             print(f"✓ Efeitos de clima e trânsito aplicados a {affected_edges} arestas")
     
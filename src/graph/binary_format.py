@@ -0,0 +1,244 @@
+"""
+Formato binário do grafo, pensado para ser aberto com mmap.
+
+Layout do ficheiro (little-endian, secções alinhadas a 8 bytes):
+
+    cabeçalho      magic, versão, flags, nº de nós, nº de arestas e a tabela
+                   de secções (offset, tamanho em bytes)
+    metadata       JSON (parâmetros que geraram o grafo, p.ex. a chave da cache)
+    coords         float64[2 * n]  (x0, y0, x1, y1, ...)
+    node_types     uint8[n]        (índice em NODE_TYPES)
+    offsets        int64[n + 1]    (CSR: arestas de u em [offsets[u], offsets[u + 1]))
+    targets        int32[m]
+    distances      float64[m]
+    base_times     float64[m]
+    open_mask      uint8[m]
+
+Ao carregar, todas as colunas são vistas (memoryview) sobre o ficheiro mapeado,
+sem cópia. Vários processos que abram o mesmo ficheiro partilham as mesmas
+páginas físicas. Os eventos escrevem numa cópia privada da coluna de tempos
+(ver CSRGraph.writable_column), nunca no ficheiro.
+"""
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+
+from graph.csr_graph import CSRGraph
+from graph.graph import Graph
+from graph.node import Node
+from graph.position import Position
+
+MAGIC = b'UBERGRPH'
+FORMAT_VERSION = 1
+NODE_TYPES = ("generic", "pickup", "charging", "fuel", "depot")
+
+# Ordem das secções no ficheiro: (nome, formato do memoryview)
+SECTIONS = (
+    ('metadata', 'B'),
+    ('coords', 'd'),
+    ('node_types', 'B'),
+    ('offsets', 'q'),
+    ('targets', 'i'),
+    ('distances', 'd'),
+    ('base_times', 'd'),
+    ('open_mask', 'B'),
+)
+
+_HEADER_PREFIX = struct.Struct('<8sIIqq')
+_SECTION_ENTRY = struct.Struct('<qq')
+HEADER_SIZE = _HEADER_PREFIX.size + _SECTION_ENTRY.size * len(SECTIONS)
+
+_FLAG_DIRECTED = 1
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def save_graph_binary(graph: Graph, path: str, metadata: dict = None) -> None:
+    """
+    Escreve o grafo no formato binário.
+
+    Args:
+        graph: Graph ou CSRGraph a guardar (o tempo base de cada aresta é o
+               'base_time' se existir, senão o tempo atual)
+        path: Caminho do ficheiro de destino
+        metadata: Dicionário serializável em JSON guardado no cabeçalho
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    n = csr.num_nodes
+    type_codes = {name: code for code, name in enumerate(NODE_TYPES)}
+
+    coords = array('d')
+    node_types = bytearray()
+    for node in csr.nodes:
+        coords.append(node.position.x)
+        coords.append(node.position.y)
+        node_types.append(type_codes.get(node.node_type, 0))
+
+    payloads = {
+        'metadata': json.dumps(metadata or {}, sort_keys=True).encode('utf-8'),
+        'coords': coords.tobytes(),
+        'node_types': bytes(node_types),
+        'offsets': array('q', csr.offsets).tobytes(),
+        'targets': array('i', csr.targets).tobytes(),
+        'distances': array('d', csr.distances).tobytes(),
+        'base_times': array('d', csr.base_times).tobytes(),
+        'open_mask': bytes(csr.open_mask),
+    }
+
+    table = []
+    offset = _align(HEADER_SIZE)
+    for name, _ in SECTIONS:
+        table.append((offset, len(payloads[name])))
+        offset = _align(offset + len(payloads[name]))
+
+    flags = _FLAG_DIRECTED if csr.directed else 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER_PREFIX.pack(MAGIC, FORMAT_VERSION, flags, n, csr.num_edges))
+        for entry in table:
+            f.write(_SECTION_ENTRY.pack(*entry))
+        for (name, _), (section_offset, _) in zip(SECTIONS, table):
+            f.write(b'\x00' * (section_offset - f.tell()))
+            f.write(payloads[name])
+    os.replace(tmp_path, path)
+
+
+def read_graph_metadata(path: str) -> dict:
+    """Lê apenas o cabeçalho e a metadata de um ficheiro binário (sem mapear as arestas)."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+        _, _, _, table = _parse_header(header)
+        meta_offset, meta_size = table['metadata']
+        f.seek(meta_offset)
+        return json.loads(f.read(meta_size).decode('utf-8'))
+
+
+def _parse_header(header):
+    if len(header) < HEADER_SIZE:
+        raise ValueError("Ficheiro de grafo truncado")
+    magic, version, flags, n, m = _HEADER_PREFIX.unpack_from(header, 0)
+    if magic != MAGIC:
+        raise ValueError("Ficheiro não está no formato binário de grafo")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Versão de formato {version} não suportada (esperada {FORMAT_VERSION})")
+    table = {}
+    for i, (name, _) in enumerate(SECTIONS):
+        table[name] = _SECTION_ENTRY.unpack_from(header, _HEADER_PREFIX.size + i * _SECTION_ENTRY.size)
+    return flags, n, m, table
+
+
+class MappedNodeList(Sequence):
+    """
+    Lista de nós sobre as coordenadas mapeadas.
+    Os objetos Node são criados na primeira vez que são acedidos e reutilizados
+    depois (alterações como node_type ficam no processo atual).
+    """
+
+    def __init__(self, coords, node_types) -> None:
+        self._coords = coords
+        self._node_types = node_types
+        self._materialized = {}
+
+    def __len__(self):
+        return len(self._node_types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        node = self._materialized.get(index)
+        if node is None:
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+            position = Position(self._coords[2 * index], self._coords[2 * index + 1])
+            node = Node(index, position, node_type=NODE_TYPES[self._node_types[index]])
+            self._materialized[index] = node
+        return node
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class MappedCSRGraph(CSRGraph):
+    """
+    CSRGraph cujas colunas são vistas sobre um ficheiro mapeado em memória.
+    Ao ser serializado (pickle) guarda apenas o caminho e as colunas já
+    copiadas pelo processo; ao ser restaurado volta a mapear o ficheiro.
+    """
+
+    _SHARED_COLUMNS = ('offsets', 'targets', 'distances', 'base_times', 'times', 'open_mask')
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._map_file()
+        flags, n, m, table = self._header
+        sections = self._sections
+        super().__init__(
+            MappedNodeList(sections['coords'], sections['node_types']),
+            sections['offsets'],
+            sections['targets'],
+            sections['distances'],
+            sections['base_times'],
+            open_mask=sections['open_mask'],
+            directed=bool(flags & _FLAG_DIRECTED),
+            coords=sections['coords'],
+        )
+        self.metadata = json.loads(bytes(sections['metadata']).decode('utf-8'))
+
+    def _map_file(self) -> None:
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        self._header = _parse_header(buffer[:HEADER_SIZE])
+        table = self._header[3]
+        self._sections = {}
+        for name, fmt in SECTIONS:
+            offset, size = table[name]
+            if offset + size > len(buffer):
+                raise ValueError("Ficheiro de grafo truncado")
+            self._sections[name] = buffer[offset:offset + size].cast(fmt)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        for name in ('_mmap', '_sections', 'coords'):
+            state.pop(name, None)
+        for name in self._SHARED_COLUMNS:
+            column = state[name]
+            if isinstance(column, memoryview):
+                # Ainda partilhada com o ficheiro: volta a ser mapeada ao restaurar
+                state[name] = None
+        state['_materialized_nodes'] = self.nodes._materialized
+        del state['nodes']
+        return state
+
+    def __setstate__(self, state):
+        materialized = state.pop('_materialized_nodes')
+        self.__dict__.update(state)
+        self._map_file()
+        sections = self._sections
+        for name in self._SHARED_COLUMNS:
+            if getattr(self, name) is None:
+                setattr(self, name, sections[name] if name != 'times' else sections['base_times'])
+        self.coords = sections['coords']
+        self.nodes = MappedNodeList(sections['coords'], sections['node_types'])
+        self.nodes._materialized = materialized
+
+
+def load_graph_binary(path: str) -> MappedCSRGraph:
+    """
+    Abre um grafo no formato binário sem copiar as colunas (mmap, só leitura).
+
+    Args:
+        path: Caminho do ficheiro
+
+    Returns:
+        MappedCSRGraph
+    """
+    return MappedCSRGraph(path)
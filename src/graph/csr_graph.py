@@ -0,0 +1,416 @@
+"""
+Representação compacta do grafo em formato CSR (compressed sparse row).
+
+Os atributos das arestas são guardados em colunas contíguas (array/bytearray)
+em vez de um dicionário por aresta. A API de dicionários de Graph continua
+disponível através de vistas (CSREdgeView), para compatibilidade com o código
+que lê ou altera graph.edges diretamente (eventos, visualização).
+"""
+from array import array
+from collections.abc import Mapping, Sequence
+
+from graph.graph import Graph
+from graph.spatial_index import GridIndex
+
+
+class CSREdgeView(Mapping):
+    """Vista tipo dicionário sobre uma aresta guardada em colunas."""
+
+    __slots__ = ('_graph', '_pos')
+
+    _KEYS = ('target', 'distance', 'time', 'open', 'base_time', 'weather', 'traffic')
+
+    def __init__(self, graph: 'CSRGraph', pos: int) -> None:
+        self._graph = graph
+        self._pos = pos
+
+    def __getitem__(self, key):
+        g = self._graph
+        i = self._pos
+        if key == 'target':
+            return g.targets[i]
+        if key == 'distance':
+            return g.distances[i]
+        if key == 'time':
+            return g.times[i]
+        if key == 'open':
+            return bool(g.open_mask[i])
+        if key == 'base_time':
+            return g.base_times[i]
+        if key == 'weather':
+            return g.labels[g.weather_codes[i]]
+        if key == 'traffic':
+            return g.labels[g.traffic_codes[i]]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        g = self._graph
+        i = self._pos
+        if key == 'time':
+            g.writable_column('times')[i] = value
+        elif key == 'open':
+            g.writable_column('open_mask')[i] = 1 if value else 0
+        elif key == 'base_time':
+            g.writable_column('base_times')[i] = value
+        elif key == 'weather':
+            g.weather_codes[i] = g.label_code(value)
+        elif key == 'traffic':
+            g.traffic_codes[i] = g.label_code(value)
+        else:
+            raise KeyError(f"Atributo '{key}' não pode ser alterado num grafo CSR")
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"CSREdgeView({dict(self)})"
+
+
+class _CSREdgeList(Sequence):
+    """Lista (só de leitura) das arestas que saem de um nó."""
+
+    __slots__ = ('_graph', '_start', '_end')
+
+    def __init__(self, graph: 'CSRGraph', start: int, end: int) -> None:
+        self._graph = graph
+        self._start = start
+        self._end = end
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CSREdgeView(self._graph, i) for i in range(self._start, self._end)[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return CSREdgeView(self._graph, self._start + index)
+
+    def __len__(self):
+        return self._end - self._start
+
+
+class _CSREdgeMap(Mapping):
+    """Mapeamento node_id -> arestas, equivalente a Graph.edges."""
+
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph: 'CSRGraph') -> None:
+        self._graph = graph
+
+    def __getitem__(self, node_id):
+        g = self._graph
+        if not isinstance(node_id, int) or not 0 <= node_id < g.num_nodes:
+            raise KeyError(node_id)
+        return _CSREdgeList(g, g.offsets[node_id], g.offsets[node_id + 1])
+
+    def __iter__(self):
+        return iter(range(self._graph.num_nodes))
+
+    def __len__(self):
+        return self._graph.num_nodes
+
+
+class _CSREdgeIndex(Mapping):
+    """Mapeamento (origem, destino) -> aresta, equivalente a Graph.edge_index."""
+
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph: 'CSRGraph') -> None:
+        self._graph = graph
+
+    def __getitem__(self, key):
+        return CSREdgeView(self._graph, self._graph.edge_positions()[key])
+
+    def __contains__(self, key):
+        return key in self._graph.edge_positions()
+
+    def __iter__(self):
+        return iter(self._graph.edge_positions())
+
+    def __len__(self):
+        return len(self._graph.edge_positions())
+
+
+class CSRGraph(Graph):
+    """
+    Grafo com topologia fixa guardada em formato CSR.
+
+    Colunas (uma posição por aresta dirigida, agrupadas por nó de origem):
+        offsets:      arestas do nó u ocupam [offsets[u], offsets[u + 1])
+        targets:      nó de destino
+        distances:    distância em metros
+        base_times:   tempo base em minutos (sem eventos)
+        times:        tempo atual em minutos (com eventos aplicados)
+        open_mask:    1 se a estrada está aberta, 0 se fechada
+
+    As coordenadas dos nós ficam também num array contíguo (coords, x0, y0,
+    x1, y1, ...), para as heurísticas e o índice espacial as lerem sem passar
+    pelos objetos Node.
+
+    As colunas podem ser partilhadas (por exemplo, vistas só de leitura sobre um
+    ficheiro mapeado em memória, ver graph.binary_format). Nesse caso a primeira
+    escrita cria uma cópia privada da coluna (copy-on-write), e o tempo atual
+    começa por ser o próprio tempo base.
+    """
+
+    _DERIVED_CACHES = Graph._DERIVED_CACHES + ('_edge_positions', '_reverse_csr')
+
+    def __init__(self, nodes, offsets, targets, distances, base_times, times=None,
+                 open_mask=None, directed=False, coords=None):
+        # Não chama Graph.__init__: as arestas vivem nas colunas
+        self.nodes = nodes
+        if coords is None:
+            coords = array('d')
+            for node in nodes:
+                coords.append(node.position.x)
+                coords.append(node.position.y)
+        self.coords = coords
+        self.directed = directed
+        self.next_id = len(nodes)
+        self.offsets = offsets
+        self.targets = targets
+        self.distances = distances
+        self.base_times = base_times
+        self.times = times if times is not None else base_times
+        self.open_mask = open_mask if open_mask is not None else bytearray(b'\x01' * len(targets))
+        self.labels = ['clear']
+        self._label_codes = {'clear': 0}
+        self.weather_codes = bytearray(len(targets))
+        self.traffic_codes = bytearray(len(targets))
+        self._edge_positions = None
+        self._reverse_csr = None
+        self._spatial_index = None
+        self._reverse_edges = None
+        self._landmark_tables = None
+        self._contraction_hierarchy = None
+        self._search_workspace = None
+        self._cost_layers = None
+        self.epoch = 0
+        self.edges = _CSREdgeMap(self)
+        self.edge_index = _CSREdgeIndex(self)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'CSRGraph':
+        """
+        Converte um Graph (dicionários) para CSR, mantendo a ordem das arestas
+        de cada nó (os algoritmos desempatam pela ordem de expansão).
+        """
+        offsets = array('q', [0])
+        targets = array('i')
+        distances = array('d')
+        base_times = array('d')
+        times = array('d')
+        open_mask = bytearray()
+        for node in graph.nodes:
+            for edge in graph.edges[node.id]:
+                targets.append(edge["target"])
+                distances.append(edge.get("distance", 0.0))
+                times.append(edge.get("time", 0.0))
+                base_times.append(edge.get("base_time", edge.get("time", 0.0)))
+                open_mask.append(1 if edge.get("open", True) else 0)
+            offsets.append(len(targets))
+        csr = cls(graph.nodes, offsets, targets, distances, base_times, times=times,
+                  open_mask=open_mask, directed=graph.directed)
+        for node in graph.nodes:
+            for i, edge in enumerate(graph.edges[node.id], offsets[node.id]):
+                if "weather" in edge:
+                    csr.weather_codes[i] = csr.label_code(edge["weather"])
+                if "traffic" in edge:
+                    csr.traffic_codes[i] = csr.label_code(edge["traffic"])
+        return csr
+
+    def spatial_index(self):
+        if self._spatial_index is None:
+            coords = self.coords
+            self._spatial_index = GridIndex.from_points(
+                (i, coords[2 * i], coords[2 * i + 1]) for i in range(self.num_nodes)
+            )
+        return self._spatial_index
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def label_code(self, label: str) -> int:
+        """Código (0-255) de uma etiqueta de clima/trânsito."""
+        code = self._label_codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(label)
+            self._label_codes[label] = code
+        return code
+
+    def writable_column(self, name):
+        """
+        Retorna uma coluna que pode ser alterada, copiando-a se ainda é partilhada.
+
+        Args:
+            name: Nome do atributo ('times', 'open_mask', 'base_times', ...)
+        """
+        column = getattr(self, name)
+        shared = isinstance(column, memoryview) and column.readonly
+        if name == 'times' and column is self.base_times:
+            shared = True
+        if shared:
+            if isinstance(column, (bytearray, bytes)) or getattr(column, 'format', None) == 'B':
+                column = bytearray(column)
+            else:
+                typecode = column.typecode if isinstance(column, array) else column.format
+                column = array(typecode, column)
+            setattr(self, name, column)
+        return column
+
+    def edge_positions(self):
+        """Dicionário (origem, destino) -> posição da primeira aresta, construído a pedido."""
+        if self._edge_positions is None:
+            positions = {}
+            offsets = self.offsets
+            targets = self.targets
+            for u in range(self.num_nodes):
+                for i in range(offsets[u], offsets[u + 1]):
+                    positions.setdefault((u, targets[i]), i)
+            self._edge_positions = positions
+        return self._edge_positions
+
+    # ========================================
+    # TOPOLOGIA FIXA
+    # ========================================
+
+    def add_node(self, x, y, node_type="generic"):
+        raise TypeError("CSRGraph tem topologia fixa; construa um Graph e converta com from_graph")
+
+    def add_edge(self, id1, id2, distance=None, edge_speed=None, travel_time=None, open=True):
+        raise TypeError("CSRGraph tem topologia fixa; construa um Graph e converta com from_graph")
+
+    # ========================================
+    # ACESSO ÀS ARESTAS
+    # ========================================
+
+    def get_edge(self, node1_id, node2_id):
+        pos = self.edge_positions().get((node1_id, node2_id))
+        return CSREdgeView(self, pos) if pos is not None else None
+
+    def get_edge_time(self, node1_id, node2_id):
+        pos = self.edge_positions().get((node1_id, node2_id))
+        return self.times[pos] if pos is not None else None
+
+    def set_edge_open(self, node1_id, node2_id, open):
+        if (node1_id, node2_id) not in self.edge_positions():
+            return False
+        flag = 1 if open else 0
+        targets = self.targets
+        open_mask = self.writable_column('open_mask')
+        for i in range(self.offsets[node1_id], self.offsets[node1_id + 1]):
+            if targets[i] == node2_id:
+                open_mask[i] = flag
+        self.mark_edges_changed()
+        return True
+
+    # Colunas com o estado mutável das arestas (base_times antes de times, ver restore_edge_state)
+    _STATE_COLUMNS = ('base_times', 'times', 'open_mask', 'weather_codes', 'traffic_codes')
+
+    def edge_state(self):
+        """
+        Copia as colunas mutáveis das arestas. As colunas só de leitura
+        (partilhadas com um ficheiro mapeado) não são copiadas.
+
+        Returns:
+            Estado opaco para restore_edge_state
+        """
+        state = {'labels': list(self.labels)}
+        for name in self._STATE_COLUMNS:
+            column = getattr(self, name)
+            if name == 'times' and column is self.base_times:
+                state[name] = None  # O tempo atual ainda é o próprio tempo base
+            elif isinstance(column, memoryview) and column.readonly:
+                state[name] = column
+            else:
+                state[name] = column[:]
+        return state
+
+    def restore_edge_state(self, state):
+        """Repõe as colunas guardadas por edge_state e muda o epoch."""
+        if len(state['open_mask']) != len(self.targets):
+            raise ValueError("O estado das arestas não corresponde à topologia do grafo")
+        for name in self._STATE_COLUMNS:
+            column = state[name]
+            if column is None:
+                column = self.base_times
+            elif not (isinstance(column, memoryview) and column.readonly):
+                column = column[:]
+            setattr(self, name, column)
+        self.labels = list(state['labels'])
+        self._label_codes = {label: code for code, label in enumerate(self.labels)}
+        self.mark_edges_changed()
+
+    def reverse_csr(self):
+        """
+        Índice CSR das arestas de entrada, construído a pedido.
+
+        Returns:
+            Tuple[array, array, array]: (offsets, origens, posições das arestas nas colunas)
+        """
+        if self._reverse_csr is None:
+            n = self.num_nodes
+            offsets = self.offsets
+            targets = self.targets
+            counts = [0] * (n + 1)
+            for i in range(self.num_edges):
+                counts[targets[i] + 1] += 1
+            for v in range(n):
+                counts[v + 1] += counts[v]
+            rev_offsets = array('q', counts)
+            fill = counts[:-1]
+            sources = array('i', bytes(4 * self.num_edges))
+            positions = array('q', bytes(8 * self.num_edges))
+            for u in range(n):
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    sources[fill[v]] = u
+                    positions[fill[v]] = i
+                    fill[v] += 1
+            self._reverse_csr = (rev_offsets, sources, positions)
+        return self._reverse_csr
+
+    def predecessors(self, node_id):
+        rev_offsets, sources, positions = self.reverse_csr()
+        distances = self.distances
+        times = self.times
+        open_mask = self.open_mask
+        result = []
+        for j in range(rev_offsets[node_id], rev_offsets[node_id + 1]):
+            i = positions[j]
+            if open_mask[i]:
+                result.append((sources[j], distances[i], times[i]))
+        return result
+
+    def neighbors(self, node_id):
+        targets = self.targets
+        distances = self.distances
+        times = self.times
+        open_mask = self.open_mask
+        return [
+            (targets[i], distances[i], times[i])
+            for i in range(self.offsets[node_id], self.offsets[node_id + 1])
+            if open_mask[i]
+        ]
+
+    def calculate_path_metrics(self, path):
+        total_distance = 0.0
+        total_time = 0.0
+        if not path or len(path) < 2:
+            return total_distance, total_time
+        positions = self.edge_positions()
+        for i in range(len(path) - 1):
+            pos = positions.get((path[i], path[i + 1]))
+            if pos is not None:
+                total_distance += self.distances[pos]
+                total_time += self.times[pos]
+        return total_distance, total_time
@@ -1,5 +1,6 @@
 from graph.node import Node
 from graph.position import Position
+from graph.spatial_index import GridIndex
 import matplotlib.pyplot as plt
 
 # Constantes importadas do config
@@ -27,8 +28,7 @@ class Graph:
         for i in range(len(path) - 1):
             node_id = path[i]
             next_id = path[i + 1]
-            # Procura a aresta entre node_id e next_id
-            edge = next((e for e in self.edges[node_id] if e["target"] == next_id), None)
+            edge = self.edge_index.get((node_id, next_id))
             if edge:
                 total_distance += edge["distance"]
                 total_time += edge.get("time", 0.0)
@@ -36,18 +36,61 @@ class Graph:
     
     def find_closest_node(self, position):
         """Retorna o nó mais próximo da posição dada."""
-        min_dist = float('inf')
-        closest = None
-        for node in self.nodes:
-            dist = node.position.distance_to(position)
-            if dist < min_dist:
-                min_dist = dist
-                closest = node
-        return closest
+        node_id = self.spatial_index().nearest(position.x, position.y)
+        return self.nodes[node_id] if node_id is not None else None
+
+    def find_k_closest_nodes(self, position, k):
+        """
+        Retorna os k nós mais próximos da posição dada.
+
+        Args:
+            position: Posição de referência
+            k: Número de nós a devolver
+
+        Returns:
+            List[Node]: Nós ordenados por distância crescente
+        """
+        return [self.nodes[node_id] for _, node_id in self.spatial_index().k_nearest(position.x, position.y, k)]
+
+    def spatial_index(self):
+        """
+        Retorna o índice espacial dos nós, construindo-o na primeira utilização.
+        Só é invalidado quando são adicionados nós.
+        """
+        if self._spatial_index is None:
+            self._spatial_index = GridIndex.from_points(
+                (node.id, node.position.x, node.position.y) for node in self.nodes
+            )
+        return self._spatial_index
     
+    # Estruturas derivadas que não são serializadas (reconstruídas a pedido)
+    _DERIVED_CACHES = ('_spatial_index', '_reverse_edges', '_landmark_tables', '_contraction_hierarchy',
+                       '_search_workspace', '_cost_layers')
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._DERIVED_CACHES:
+            state[name] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Grafos guardados por versões anteriores podem não ter todos os atributos
+        for name in self._DERIVED_CACHES:
+            self.__dict__.setdefault(name, None)
+        self.__dict__.setdefault('epoch', 0)
+
     def __init__(self, directed=False):
         self.nodes = []
         self.edges = {}
+        self.edge_index = {}  # {(id_origem, id_destino): aresta} para acesso O(1)
+        self._spatial_index = None  # GridIndex construído a pedido (ver spatial_index)
+        self._reverse_edges = None  # {id_destino: [(id_origem, aresta)]} construído a pedido
+        self._landmark_tables = None  # Tabelas ALT por perfil de custo (ver algorithms.informed.landmarks)
+        self._contraction_hierarchy = None  # Ver algorithms.hierarchical.contraction_hierarchies
+        self._search_workspace = None  # Arrays reutilizados pelas procuras (ver algorithms.utils.workspace)
+        self._cost_layers = None  # Custos das arestas por perfil de veículo (ver algorithms.utils.cost_layers)
+        self.epoch = 0  # Incrementado sempre que o tempo ou o estado das arestas muda
         self.directed = directed
         self.next_id = 0
 
@@ -58,6 +101,11 @@ class Graph:
 
         self.nodes.append(node)
         self.edges[self.next_id] = []
+        self._spatial_index = None
+        self._reverse_edges = None
+        self._landmark_tables = None
+        self._contraction_hierarchy = None
+        self._cost_layers = None
 
         self.next_id += 1
         return node
@@ -114,6 +162,12 @@ class Graph:
             "open": open
         }
         self.edges[id1].append(edge_info)
+        self._reverse_edges = None
+        self._landmark_tables = None
+        self._contraction_hierarchy = None
+        self._cost_layers = None
+        # Em arestas paralelas o índice mantém a primeira (como a procura linear fazia)
+        self.edge_index.setdefault((id1, id2), edge_info)
 
         # Cria a aresta reversa (i.e, contexto da estrada com dois sentidos)
         if not self.directed:
@@ -124,6 +178,72 @@ class Graph:
                 "open": open
             }
             self.edges[id2].append(reverse_info)
+            self.edge_index.setdefault((id2, id1), reverse_info)
+
+    def get_edge(self, node1_id, node2_id):
+        """
+        Obtém a aresta entre dois nós em tempo constante.
+
+        Args:
+            node1_id: ID do nó de origem
+            node2_id: ID do nó de destino
+
+        Returns:
+            dict: Informação da aresta, ou None se não existe
+        """
+        return self.edge_index.get((node1_id, node2_id))
+
+    def set_edge_open(self, node1_id, node2_id, open):
+        """
+        Abre ou fecha todas as arestas (incluindo paralelas) de node1_id para node2_id.
+
+        Args:
+            node1_id: ID do nó de origem
+            node2_id: ID do nó de destino
+            open (bool): Novo estado da estrada
+
+        Returns:
+            bool: True se existia pelo menos uma aresta
+        """
+        if (node1_id, node2_id) not in self.edge_index:
+            return False
+        for edge in self.edges[node1_id]:
+            if edge["target"] == node2_id:
+                edge["open"] = open
+        self.mark_edges_changed()
+        return True
+
+    def mark_edges_changed(self):
+        """
+        Regista que o tempo ou o estado de arestas mudou (eventos, estradas fechadas).
+        Estruturas que dependem dos pesos atuais comparam o epoch para saber se
+        estão desatualizadas.
+        """
+        self.epoch += 1
+
+    def edge_state(self):
+        """
+        Copia o estado mutável das arestas (tempo, aberta/fechada, tempo base,
+        clima e trânsito), sem a topologia. Ver restore_edge_state.
+
+        Returns:
+            Estado opaco para restore_edge_state
+        """
+        return [dict(edge) for edges in self.edges.values() for edge in edges]
+
+    def restore_edge_state(self, state):
+        """
+        Repõe o estado das arestas guardado por edge_state (a topologia tem de
+        ser a mesma). Muda o epoch, para as caches de custos não servirem
+        valores calculados com outros tempos.
+        """
+        edges = [edge for edge_list in self.edges.values() for edge in edge_list]
+        if len(edges) != len(state):
+            raise ValueError("O estado das arestas não corresponde à topologia do grafo")
+        for edge, saved in zip(edges, state):
+            edge.clear()
+            edge.update(saved)
+        self.mark_edges_changed()
 
     def get_edge_time(self, node1_id, node2_id):
         """
@@ -136,11 +256,48 @@ class Graph:
         Returns:
             float: Tempo em minutos, ou None se aresta não existe
         """
-        if node1_id in self.edges:
-            for edge in self.edges[node1_id]:
-                if edge["target"] == node2_id:
-                    return edge.get("time", 0)
-        return None
+        edge = self.edge_index.get((node1_id, node2_id))
+        if edge is None:
+            return None
+        return edge.get("time", 0)
+
+    def predecessors(self, node_id):
+        """
+        Retorna as arestas abertas que chegam a um nó (usado nas procuras para trás).
+
+        Args:
+            node_id: ID do nó de destino
+
+        Returns:
+            List[Tuple[int, float, float]]: (origem, distância em metros, tempo em minutos)
+        """
+        if self._reverse_edges is None:
+            reverse = {node.id: [] for node in self.nodes}
+            for source, edges in self.edges.items():
+                for edge in edges:
+                    reverse[edge["target"]].append((source, edge))
+            self._reverse_edges = reverse
+        return [
+            (source, edge.get("distance", 0.0), edge.get("time", 0.0))
+            for source, edge in self._reverse_edges[node_id]
+            if edge.get("open", True)
+        ]
+
+    def neighbors(self, node_id):
+        """
+        Retorna as arestas abertas que saem de um nó, no formato usado pelos algoritmos.
+
+        Args:
+            node_id: ID do nó de origem
+
+        Returns:
+            List[Tuple[int, float, float]]: (destino, distância em metros, tempo em minutos)
+        """
+        return [
+            (edge["target"], edge.get("distance", 0.0), edge.get("time", 0.0))
+            for edge in self.edges[node_id]
+            if edge.get("open", True)
+        ]
 
     
     def draw(self, ax, show_labels=True, requests=None):
@@ -0,0 +1,175 @@
+"""
+Índice espacial em grelha uniforme para procura de nós próximos.
+Evita percorrer todos os nós do grafo sempre que se converte uma posição num nó.
+"""
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class GridIndex:
+    """
+    Grelha uniforme de células quadradas com os IDs dos pontos em cada célula.
+
+    As procuras percorrem anéis de células à volta da célula da posição dada e
+    param assim que nenhuma célula ainda por visitar pode conter um ponto mais
+    próximo. Em caso de empate na distância ganha o ID mais baixo, tal como na
+    procura linear por ordem de inserção.
+    """
+
+    def __init__(self, cell_size: float) -> None:
+        """
+        Args:
+            cell_size: Lado de cada célula em metros (> 0)
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_size deve ser positivo")
+        self.cell_size: float = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.points: Dict[int, Tuple[float, float]] = {}
+        # Limites das células ocupadas (para saber quando parar a procura)
+        self.min_cx = self.min_cy = math.inf
+        self.max_cx = self.max_cy = -math.inf
+
+    @classmethod
+    def from_points(cls, points: Iterable[Tuple[int, float, float]], target_per_cell: float = 2.0) -> 'GridIndex':
+        """
+        Constrói um índice com tamanho de célula adequado à densidade dos pontos.
+
+        Args:
+            points: Iterável de (id, x, y)
+            target_per_cell: Número médio de pontos desejado por célula
+        """
+        points = list(points)
+        if not points:
+            return cls(1.0)
+        xs = [p[1] for p in points]
+        ys = [p[2] for p in points]
+        width = max(xs) - min(xs)
+        height = max(ys) - min(ys)
+        area = max(width, 1.0) * max(height, 1.0)
+        cell_size = math.sqrt(area * target_per_cell / len(points))
+        index = cls(max(cell_size, 1.0))
+        for point_id, x, y in points:
+            index.insert(point_id, x, y)
+        return index
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def insert(self, point_id: int, x: float, y: float) -> None:
+        """Adiciona um ponto ao índice."""
+        cell = self._cell(x, y)
+        self.cells.setdefault(cell, []).append(point_id)
+        self.points[point_id] = (x, y)
+        cx, cy = cell
+        self.min_cx = min(self.min_cx, cx)
+        self.max_cx = max(self.max_cx, cx)
+        self.min_cy = min(self.min_cy, cy)
+        self.max_cy = max(self.max_cy, cy)
+
+    def remove(self, point_id: int) -> None:
+        """Remove um ponto do índice (os limites da grelha não encolhem)."""
+        x, y = self.points.pop(point_id)
+        cell = self._cell(x, y)
+        bucket = self.cells[cell]
+        bucket.remove(point_id)
+        if not bucket:
+            del self.cells[cell]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _ring(self, cx: int, cy: int, r: int):
+        """Gera as células ocupadas do anel de raio r (distância de Chebyshev)."""
+        if r == 0:
+            bucket = self.cells.get((cx, cy))
+            if bucket:
+                yield bucket
+            return
+        for i in range(cx - r, cx + r + 1):
+            for j in (cy - r, cy + r):
+                bucket = self.cells.get((i, j))
+                if bucket:
+                    yield bucket
+        for j in range(cy - r + 1, cy + r):
+            for i in (cx - r, cx + r):
+                bucket = self.cells.get((i, j))
+                if bucket:
+                    yield bucket
+
+    def _max_ring(self, cx: int, cy: int) -> int:
+        """Raio a partir do qual já não existem células ocupadas."""
+        return int(max(abs(cx - self.min_cx), abs(cx - self.max_cx),
+                       abs(cy - self.min_cy), abs(cy - self.max_cy)))
+
+    def nearest(self, x: float, y: float) -> Optional[int]:
+        """
+        Retorna o ID do ponto mais próximo de (x, y), ou None se o índice está vazio.
+        """
+        if not self.points:
+            return None
+        cx, cy = self._cell(x, y)
+        best_id = None
+        best_dist = math.inf
+        points = self.points
+        for r in range(self._max_ring(cx, cy) + 1):
+            # Qualquer ponto no anel r está a mais de (r - 1) células de distância
+            if best_id is not None and (r - 1) * self.cell_size > best_dist:
+                break
+            for bucket in self._ring(cx, cy, r):
+                for point_id in bucket:
+                    px, py = points[point_id]
+                    dist = math.sqrt((px - x) ** 2 + (py - y) ** 2)
+                    if dist < best_dist or (dist == best_dist and point_id < best_id):
+                        best_dist = dist
+                        best_id = point_id
+        return best_id
+
+    def k_nearest(self, x: float, y: float, k: int) -> List[Tuple[float, int]]:
+        """
+        Retorna os k pontos mais próximos de (x, y).
+
+        Returns:
+            List[Tuple[float, int]]: Pares (distância, id) por ordem crescente
+        """
+        if k <= 0 or not self.points:
+            return []
+        cx, cy = self._cell(x, y)
+        # Max-heap de tamanho k com (-distância, -id)
+        heap: List[Tuple[float, int]] = []
+        points = self.points
+        for r in range(self._max_ring(cx, cy) + 1):
+            if len(heap) == k and (r - 1) * self.cell_size > -heap[0][0]:
+                break
+            for bucket in self._ring(cx, cy, r):
+                for point_id in bucket:
+                    px, py = points[point_id]
+                    dist = math.sqrt((px - x) ** 2 + (py - y) ** 2)
+                    entry = (-dist, -point_id)
+                    if len(heap) < k:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+        return sorted((-d, -i) for d, i in heap)
+
+    def within(self, x: float, y: float, radius: float) -> List[int]:
+        """
+        Retorna os IDs de todos os pontos a distância estritamente inferior a radius.
+        """
+        if not self.points:
+            return []
+        cx, cy = self._cell(x, y)
+        reach = int(math.ceil(radius / self.cell_size))
+        found = []
+        points = self.points
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                bucket = self.cells.get((i, j))
+                if not bucket:
+                    continue
+                for point_id in bucket:
+                    px, py = points[point_id]
+                    if math.sqrt((px - x) ** 2 + (py - y) ** 2) < radius:
+                        found.append(point_id)
+        return found
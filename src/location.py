@@ -1,19 +1,121 @@
 from graph.graph import Graph 
 from graph.position import Position  
-import osmnx as ox
-import math
+from graph.spatial_index import GridIndex
+import hashlib
+import os
+import pickle
+import re
 
-from config import SCALE_FACTOR 
+from config import SCALE_FACTOR, GRAPH_CACHE_ENABLED, GRAPH_CACHE_DIR, GRAPH_CACHE_VERSION, GRAPH_CACHE_FORMAT
+from graph.binary_format import save_graph_binary, load_graph_binary, read_graph_metadata
 
-def create_location_graph(place_name : str, min_distance: float = 100 * SCALE_FACTOR) -> Graph: 
+# Raiz do projeto (GRAPH_CACHE_DIR é relativo a esta pasta)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_location_graph(place_name : str, min_distance: float = 100 * SCALE_FACTOR, use_cache: bool = GRAPH_CACHE_ENABLED) -> Graph: 
     """
     Cria um grafo da rede viária de uma dada localização, usando coordenadas projetadas (em metros).
     O grafo é convertido para a estrutura definida Graph() com nós e arestas.
     
+    O grafo final (após fusão de nodos e escala) é guardado numa cache local,
+    indexada por localização, min_distance e SCALE_FACTOR. Se existir uma cache
+    válida é carregada diretamente, sem aceder ao OpenStreetMap. Com
+    GRAPH_CACHE_FORMAT = "binary" a cache é mapeada em memória (MappedCSRGraph).
+    
     Args:
         place_name: Nome da localização a carregar
         min_distance: Distância mínima (em metros) entre nodos. Nodos mais próximos que isto serão ignorados. (padrão: 10.0)
+        use_cache: Se deve ler/escrever a cache local do grafo
+    """
+    if use_cache:
+        cache_path = get_graph_cache_path(place_name, min_distance)
+        graph = load_cached_graph(cache_path, place_name, min_distance)
+        if graph is not None:
+            print(f"Mapa de {place_name} carregado da cache: {cache_path}")
+            return graph
+
+    graph = _build_location_graph(place_name, min_distance)
+
+    if use_cache:
+        save_cached_graph(cache_path, graph, place_name, min_distance)
+    return graph
+
+
+def _cache_key(place_name: str, min_distance: float) -> dict:
+    """Parâmetros que determinam o grafo gerado (e portanto a validade da cache)."""
+    return {
+        'version': GRAPH_CACHE_VERSION,
+        'place_name': place_name,
+        'min_distance': float(min_distance),
+        'scale_factor': SCALE_FACTOR,
+    }
+
+
+def get_graph_cache_path(place_name: str, min_distance: float) -> str:
+    """
+    Caminho do ficheiro de cache para uma localização e parâmetros.
     """
+    key = _cache_key(place_name, min_distance)
+    digest = hashlib.sha1(repr(sorted(key.items())).encode("utf-8")).hexdigest()[:12]
+    slug = re.sub(r"[^a-z0-9]+", "_", place_name.lower()).strip("_")
+    cache_dir = os.path.join(PROJECT_ROOT, GRAPH_CACHE_DIR)
+    extension = "ubg" if GRAPH_CACHE_FORMAT == "binary" else "pkl"
+    return os.path.join(cache_dir, f"graph_{slug}_{digest}.{extension}")
+
+
+def load_cached_graph(cache_path: str, place_name: str, min_distance: float):
+    """
+    Carrega um grafo da cache se o ficheiro existir e corresponder aos parâmetros.
+    
+    Returns:
+        Graph ou None se a cache não existe, é de outra versão ou está corrompida
+    """
+    if not os.path.exists(cache_path):
+        return None
+    if GRAPH_CACHE_FORMAT == "binary":
+        try:
+            if read_graph_metadata(cache_path) != _cache_key(place_name, min_distance):
+                return None
+            return load_graph_binary(cache_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Cache do grafo ignorada ({e})")
+            return None
+    try:
+        with open(cache_path, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        print(f"⚠ Cache do grafo ignorada ({e})")
+        return None
+    if not isinstance(payload, dict) or payload.get('key') != _cache_key(place_name, min_distance):
+        return None
+    return payload.get('graph')
+
+
+def save_cached_graph(cache_path: str, graph: Graph, place_name: str, min_distance: float) -> None:
+    """Guarda o grafo na cache (escrita atómica para não deixar ficheiros parciais)."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        if GRAPH_CACHE_FORMAT == "binary":
+            save_graph_binary(graph, cache_path, metadata=_cache_key(place_name, min_distance))
+            print(f"Grafo guardado na cache: {cache_path}")
+            return
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({'key': _cache_key(place_name, min_distance), 'graph': graph}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        print(f"Grafo guardado na cache: {cache_path}")
+    except OSError as e:
+        print(f"⚠ Não foi possível guardar a cache do grafo ({e})")
+
+
+def _build_location_graph(place_name: str, min_distance: float) -> Graph:
+    """
+    Constrói o grafo a partir do OpenStreetMap (ver create_location_graph).
+    """
+    # Import local: só é necessário quando não há cache
+    import osmnx as ox
 
     print(f"A carregar mapa de: {place_name} (distância mínima entre nodos: {min_distance}m)")
 
@@ -34,16 +136,20 @@ def create_location_graph(place_name : str, min_distance: float = 100 * SCALE_FA
     osm_to_internal = {} # usado para mapear o id OSM para o node id
     merged_nodes = 0
     
-    def find_close_node(x, y, existing_nodes, min_dist):
+    # Grelha com células de lado min_distance: só as células vizinhas podem ter
+    # nodos a menos de min_distance, o que torna a fusão quase linear
+    merge_index = GridIndex(min_distance) if min_distance > 0 else None
+    
+    def find_close_node(x, y):
         """
         Encontra um nodo já existente que esteja próximo de (x, y).
         Retorna o ID do nodo encontrado ou None se não houver nenhum próximo.
+        Se houver vários, ganha o primeiro a ser criado (menor ID).
         """
-        for node in existing_nodes:
-            dist = math.sqrt((x - node.position.x)**2 + (y - node.position.y)**2)
-            if dist < min_dist:
-                return node.id
-        return None
+        if merge_index is None:
+            return None
+        close_ids = merge_index.within(x, y, min_distance)
+        return min(close_ids) if close_ids else None
     
     # Adiciona os nós (ou mapeia para nodos próximos existentes)
     for osm_id, data in nodes.iterrows():
@@ -53,7 +159,7 @@ def create_location_graph(place_name : str, min_distance: float = 100 * SCALE_FA
         y = y * SCALE_FACTOR
 
         # Verifica se há algum nodo próximo já criado
-        close_node_id = find_close_node(x, y, graph.nodes, min_distance)
+        close_node_id = find_close_node(x, y)
         
         if close_node_id is not None:
             # Funde este nodo com o nodo próximo existente
@@ -63,6 +169,8 @@ def create_location_graph(place_name : str, min_distance: float = 100 * SCALE_FA
             # Cria um novo nodo
             node = graph.add_node(x, y)
             osm_to_internal[osm_id] = node.id
+            if merge_index is not None:
+                merge_index.insert(node.id, x, y)
 
     # Adiciona as arestas
     for (u, v, key), edge in edges.iterrows():
@@ -3,10 +3,18 @@ Ponto de entrada principal da aplicação UberUM.
 Interface de linha de comando limpa e modular.
 """
 
+import contextlib
+import io
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
 from database import load_dataset
 from algorithms import ALGORITHMS
 from simulation import Simulation
+from event_simulation import DiscreteEventSimulation
 from visualizer import Visualizer
+from config import SIMULATION_ENGINE, SIMULATION_WORKERS
 
 
 class Menu:
@@ -20,6 +28,9 @@ class Menu:
         '3': ('BFS', ALGORITHMS['bfs'], False),
         '4': ('DFS', ALGORITHMS['dfs'], False),
         '5': ('Uniform Cost', ALGORITHMS['uniform_cost'], False),
+        '6': ('A* Bidirecional', ALGORITHMS['bidirectional_a_star'], True),
+        '7': ('Dijkstra Bidirecional', ALGORITHMS['bidirectional_dijkstra'], False),
+        '8': ('Contraction Hierarchies', ALGORITHMS['contraction_hierarchies'], False),
     }
     
     @staticmethod
@@ -72,7 +83,7 @@ class Menu:
             marker = "🎯" if is_informed else "🔍"
             print(f"{key} - {marker} {name}")
         
-        choice = input("\nEscolha (1-5) [padrão: 1]: ").strip() or '1'
+        choice = input(f"\nEscolha (1-{len(Menu.ALGORITHMS)}) [padrão: 1]: ").strip() or '1'
         
         if choice in Menu.ALGORITHMS:
             name, func, is_informed = Menu.ALGORITHMS[choice]
@@ -118,18 +129,23 @@ def run_simulation(database):
     # Opções de visualização
     viz_options = Menu.choose_visualization()
     
-    # Pergunta sobre velocidade da simulação
-    print("\n--- Velocidade da Simulação ---")
-    print("Quantos minutos devem passar a cada tick?")
-    print("[1] 1 minuto (padrão - mais lento)")
-    print("[2] 2 minutos")
-    print("[5] 5 minutos (mais rápido)")
-    
-    time_step_input = input("\nEscolha [1/2/5]: ").strip()
-    time_step = int(time_step_input) if time_step_input in ['1', '2', '5'] else 1
-    
-    # Cria simulação com time_step e heurística configurados
-    simulation = Simulation(database, algo_func, time_step=time_step, heuristic=heuristic)
+    if viz_options.get('headless', False) and SIMULATION_ENGINE == 'event':
+        # Motor por eventos discretos: mesmos resultados que ticks de 1 minuto
+        time_step = 1
+        simulation = DiscreteEventSimulation(database, algo_func, heuristic=heuristic)
+    else:
+        # Pergunta sobre velocidade da simulação
+        print("\n--- Velocidade da Simulação ---")
+        print("Quantos minutos devem passar a cada tick?")
+        print("[1] 1 minuto (padrão - mais lento)")
+        print("[2] 2 minutos")
+        print("[5] 5 minutos (mais rápido)")
+        
+        time_step_input = input("\nEscolha [1/2/5]: ").strip()
+        time_step = int(time_step_input) if time_step_input in ['1', '2', '5'] else 1
+        
+        # Cria simulação com time_step e heurística configurados
+        simulation = Simulation(database, algo_func, time_step=time_step, heuristic=heuristic)
     
     # Informação da simulação
     print(f"\n📊 Informação da Simulação:")
@@ -141,7 +157,10 @@ def run_simulation(database):
     if heuristic:
         from algorithms.informed.heuristics import HEURISTICS
         print(f"   Heurística: {HEURISTICS.get(heuristic, heuristic)}")
-    print(f"   Time Step: {time_step} minuto(s) por tick")
+    if isinstance(simulation, DiscreteEventSimulation):
+        print(f"   Motor: eventos discretos (equivalente a 1 minuto por tick)")
+    else:
+        print(f"   Time Step: {time_step} minuto(s) por tick")
     print(f"   Período: 08:00 - 20:00\n")
     
     input("Pressione ENTER para iniciar a simulação...")
@@ -155,6 +174,8 @@ def run_simulation(database):
             simulation.step()
         
         print("✓ Simulação concluída!\n")
+        if 'events_processed' in simulation.stats:
+            print(f"   Eventos processados: {simulation.stats['events_processed']}\n")
     
     # Modo com visualização
     else:
@@ -187,6 +208,8 @@ def run_simulation(database):
     print(f"Tempo médio:          {stats.get('search_time_avg_ms', 0):.4f} ms")
     print(f"Tempo mínimo:         {stats.get('search_time_min_ms', 0):.4f} ms")
     print(f"Tempo máximo:         {stats.get('search_time_max_ms', 0):.4f} ms")
+    print(f"Cache de rotas:       {stats.get('route_cache_hits', 0)} acertos / "
+          f"{stats.get('route_cache_misses', 0)} falhas ({stats.get('route_cache_hit_rate', 0):.1%})")
     
     # Função de Custo Total com pesos iguais
     print("\n" + "-"*60)
@@ -284,6 +307,8 @@ def export_results_to_file(algo_name, heuristic, stats, total_emissions, total_d
         f.write(f"  Tempo médio: {stats.get('search_time_avg_ms', 0):.4f} ms\n")
         f.write(f"  Tempo mínimo: {stats.get('search_time_min_ms', 0):.4f} ms\n")
         f.write(f"  Tempo máximo: {stats.get('search_time_max_ms', 0):.4f} ms\n")
+        f.write(f"  Cache de rotas: {stats.get('route_cache_hits', 0)} acertos / "
+                f"{stats.get('route_cache_misses', 0)} falhas ({stats.get('route_cache_hit_rate', 0):.1%})\n")
         f.write("-"*70 + "\n")
     print(f"📁 Resultados exportados para: {filename}")
 
@@ -293,16 +318,124 @@ def list_vehicles(database):
     database.list_vehicles()
 
 
-def run_all_simulations(database, time_step=5, results_file="../data/resultados_todos_algoritmos.txt"):
+# Base de dados de cada processo, carregada uma vez e reposta antes de cada simulação
+_worker_database = None
+_worker_snapshot = None
+
+
+def _init_simulation_worker(database):
+    """
+    Define a base de dados do processo e guarda o estado inicial
+    (Database.snapshot) para as simulações seguintes.
+    
+    Args:
+        database: Database, ou Database serializada com pickle (processos do pool)
+    """
+    global _worker_database, _worker_snapshot
+    if isinstance(database, bytes):
+        database = pickle.loads(database)
+    _worker_database = database
+    _worker_snapshot = _worker_database.snapshot()
+
+
+def _collect_outcomes(futures):
+    """
+    Resultados das combinações, pela ordem em que foram submetidas.
+    Uma falha do próprio processo (por exemplo no _init_simulation_worker, que
+    deixa o pool em BrokenProcessPool) é devolvida como erro da combinação.
+    """
+    for future in futures:
+        try:
+            yield future.result()
+        except Exception as e:
+            yield {'error': f"{type(e).__name__}: {e}"}
+
+
+def _simulate_combination(algo_func, heuristic, time_step):
+    """
+    Corre uma combinação algoritmo/heurística na base de dados do processo,
+    reposta no estado inicial (sem recarregar o dataset).
+    Executada nos processos de run_all_simulations (ou no próprio processo).
+    
+    Args:
+        algo_func: Função do algoritmo de procura
+        heuristic: Heurística (None para algoritmos não informados)
+        time_step: Minutos por tick
+        
+    Returns:
+        dict: Estatísticas, emissões e custo total (ou 'error' com a mensagem)
+    """
+    try:
+        # Silencia as mensagens de carregamento (os processos escrevem no mesmo terminal)
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Estado limpo: repõe arestas, veículos e pedidos do início do dia
+            fresh_database = _worker_database
+            fresh_database.restore(_worker_snapshot)
+            
+            # Cria simulação
+            simulation = Simulation(fresh_database, algo_func, time_step=time_step, heuristic=heuristic)
+            
+            # Executa simulação completa (modo headless)
+            while not simulation.is_finished():
+                simulation.step()
+        
+        # Calcula estatísticas
+        stats = simulation.stats
+        
+        # Calcula emissões totais
+        total_emissions = 0.0
+        total_distance = 0.0
+        for vehicle in simulation.vehicles:
+            impact = vehicle.get_environmental_impact()
+            total_emissions += impact['total_emissions_g']
+            total_distance += impact['total_distance_km']
+        
+        # Componentes do custo normalizados
+        F_norm = stats.get('total_fuel_cost', 0.0)
+        T_norm = stats['total_time'] / 60.0
+        R_norm = stats['requests_pending']
+        D_norm = stats['total_distance'] / 1000.0
+        A_norm = total_emissions / 1000.0
+        
+        # Custo total
+        alpha = beta = epsilon = theta = delta = 1.0
+        C = alpha * F_norm + beta * T_norm + epsilon * R_norm + theta * D_norm + delta * A_norm
+        
+        return {
+            'stats': stats,
+            'total_emissions': total_emissions,
+            'total_distance': total_distance,
+            'C': C,
+            'F_norm': F_norm,
+            'T_norm': T_norm,
+            'R_norm': R_norm,
+            'D_norm': D_norm,
+            'A_norm': A_norm,
+        }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def run_all_simulations(database, time_step=5, results_file="../data/resultados_todos_algoritmos.txt",
+                        dataset_path="../data/dataset.json", workers=SIMULATION_WORKERS):
     """
     Executa TODOS os algoritmos automaticamente.
     Para algoritmos informados (A*, Greedy), corre com CADA heurística.
     Para algoritmos não-informados (BFS, DFS, Uniform Cost), corre uma vez.
     
+    As combinações são independentes e correm em paralelo num
+    ProcessPoolExecutor. A base de dados é enviada serializada uma vez a cada
+    processo, que a repõe com Database.restore antes de cada simulação; os
+    resultados são juntados pela ordem das combinações, pelo que o ficheiro e
+    o sumário são os mesmos que numa execução sequencial.
+    
     Args:
-        database: Base de dados carregada
+        database: Base de dados carregada (None = carregar dataset_path);
+                  no fim fica reposta no estado inicial
         time_step: Minutos por tick (default 5 para ser mais rápido)
         results_file: Ficheiro onde guardar os resultados
+        dataset_path: Dataset a carregar quando database é None
+        workers: Nº de processos (None = nº de CPUs, 1 = sequencial)
     """
     from algorithms.informed.heuristics import HEURISTICS
     from datetime import datetime
@@ -320,14 +453,23 @@ def run_all_simulations(database, time_step=5, results_file="../data/resultados_
             combinations.append((name, func, None))
     
     total = len(combinations)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, total))
+    
     print(f"\n{'='*70}")
     print(f"           🚀 EXECUÇÃO DE TODOS OS ALGORITMOS")
     print(f"{'='*70}")
     print(f"\nTotal de combinações a executar: {total}")
     print(f"Time step: {time_step} minuto(s) por tick")
+    print(f"Processos: {workers}")
     print(f"Resultados serão guardados em: {results_file}")
     print()
     
+    if database is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            database = load_dataset(dataset_path)
+    
     # Limpa ficheiro de resultados anterior
     with open(results_file, "w", encoding="utf-8") as f:
         f.write("="*70 + "\n")
@@ -335,49 +477,44 @@ def run_all_simulations(database, time_step=5, results_file="../data/resultados_
         f.write(f"         Executado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write("="*70 + "\n\n")
     
+    args = [(func, heuristic, time_step) for _, func, heuristic in combinations]
+    if workers > 1:
+        database_state = pickle.dumps(database, protocol=pickle.HIGHEST_PROTOCOL)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_simulation_worker,
+                                       initargs=(database_state,))
+        outcomes = _collect_outcomes([executor.submit(_simulate_combination, *a) for a in args])
+    else:
+        executor = None
+        _init_simulation_worker(database)
+        outcomes = (_simulate_combination(*a) for a in args)
+    
     results_summary = []
     
-    for i, (algo_name, algo_func, heuristic) in enumerate(combinations, 1):
-        heuristic_name = HEURISTICS.get(heuristic, "N/A") if heuristic else "N/A"
-        
-        print(f"[{i}/{total}] Executando: {algo_name}", end="")
-        if heuristic:
-            print(f" com heurística '{heuristic_name}'", end="")
-        print(" ... ", end="", flush=True)
-        
-        try:
-            # Recarrega a base de dados para cada simulação (estado limpo)
-            from database import load_dataset
-            fresh_database = load_dataset("../data/dataset.json")
-            
-            # Cria simulação
-            simulation = Simulation(fresh_database, algo_func, time_step=time_step, heuristic=heuristic)
-            
-            # Executa simulação completa (modo headless)
-            while not simulation.is_finished():
-                simulation.step()
-            
-            # Calcula estatísticas
-            stats = simulation.stats
+    try:
+        # Os resultados chegam pela ordem das combinações (ficheiro e sumário determinísticos)
+        for i, ((algo_name, algo_func, heuristic), outcome) in enumerate(zip(combinations, outcomes), 1):
+            heuristic_name = HEURISTICS.get(heuristic, "N/A") if heuristic else "N/A"
             
-            # Calcula emissões totais
-            total_emissions = 0.0
-            total_distance = 0.0
-            for vehicle in simulation.vehicles:
-                impact = vehicle.get_environmental_impact()
-                total_emissions += impact['total_emissions_g']
-                total_distance += impact['total_distance_km']
+            print(f"[{i}/{total}] {algo_name}", end="")
+            if heuristic:
+                print(f" com heurística '{heuristic_name}'", end="")
+            print(" ... ", end="", flush=True)
             
-            # Componentes do custo normalizados
-            F_norm = stats.get('total_fuel_cost', 0.0)
-            T_norm = stats['total_time'] / 60.0
-            R_norm = stats['requests_pending']
-            D_norm = stats['total_distance'] / 1000.0
-            A_norm = total_emissions / 1000.0
+            if 'error' in outcome:
+                print(f"❌ Erro: {outcome['error']}")
+                results_summary.append({
+                    'algorithm': algo_name,
+                    'heuristic': heuristic_name,
+                    'completed': 0,
+                    'cost': float('inf'),
+                    'time_ms': 0,
+                    'emissions': 0,
+                    'error': outcome['error']
+                })
+                continue
             
-            # Custo total
-            alpha = beta = epsilon = theta = delta = 1.0
-            C = alpha * F_norm + beta * T_norm + epsilon * R_norm + theta * D_norm + delta * A_norm
+            stats = outcome['stats']
+            C = outcome['C']
             
             # Guarda resultados para sumário
             results_summary.append({
@@ -386,7 +523,7 @@ def run_all_simulations(database, time_step=5, results_file="../data/resultados_
                 'completed': stats['requests_completed'],
                 'cost': C,
                 'time_ms': stats.get('search_time_avg_ms', 0),
-                'emissions': total_emissions
+                'emissions': outcome['total_emissions']
             })
             
             # Exporta para ficheiro
@@ -394,30 +531,23 @@ def run_all_simulations(database, time_step=5, results_file="../data/resultados_
                 algo_name=algo_name,
                 heuristic=heuristic,
                 stats=stats,
-                total_emissions=total_emissions,
-                total_distance=total_distance,
+                total_emissions=outcome['total_emissions'],
+                total_distance=outcome['total_distance'],
                 C=C,
-                F_norm=F_norm,
-                T_norm=T_norm,
-                R_norm=R_norm,
-                D_norm=D_norm,
-                A_norm=A_norm,
+                F_norm=outcome['F_norm'],
+                T_norm=outcome['T_norm'],
+                R_norm=outcome['R_norm'],
+                D_norm=outcome['D_norm'],
+                A_norm=outcome['A_norm'],
                 filename=results_file
             )
             
             print(f"✓ (Custo: {C:.2f}, Tempo médio: {stats.get('search_time_avg_ms', 0):.4f}ms)")
-            
-        except Exception as e:
-            print(f"❌ Erro: {e}")
-            results_summary.append({
-                'algorithm': algo_name,
-                'heuristic': heuristic_name,
-                'completed': 0,
-                'cost': float('inf'),
-                'time_ms': 0,
-                'emissions': 0,
-                'error': str(e)
-            })
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        else:
+            database.restore(_worker_snapshot)
     
     # Mostra sumário final
     print(f"\n{'='*70}")
@@ -28,5 +28,17 @@ class Request:
         self.passengers = passengers
         self.eco_friendly = eco_friendly  # Preferência por veículos ecológicos (apenas elétricos)
         self.premium = premium  # Cliente premium tem prioridade na atribuição de veículos
-        self.status = 'pending'  # 'pending', 'assigned', 'picked_up', 'completed'
+        self._status = 'pending'  # 'pending', 'assigned', 'picked_up', 'completed'
         self.assigned_vehicle = None  # referência ao veículo atribuído
+        self.status_listener = None  # Chamado com (request, estado antigo, estado novo) em cada transição
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, new_status):
+        old_status = self._status
+        self._status = new_status
+        if self.status_listener is not None and new_status != old_status:
+            self.status_listener(self, old_status, new_status)
@@ -0,0 +1,97 @@
+"""
+Cache LRU de rotas calculadas pelos algoritmos de procura.
+
+Os mesmos pares origem/destino repetem-se muito (veículos parados nos
+depósitos, pickups populares, trajetos estação → pickup). A cache guarda o
+resultado (distância, tempo, caminho) de cada procura, identificado pelos nós
+de origem e destino já ajustados ao grafo, pelo algoritmo, pelo critério da
+heurística, pelo perfil de custo do veículo e pelo epoch do grafo.
+
+O epoch muda sempre que o EventManager altera tempos de arestas ou fecha
+estradas, pelo que as rotas calculadas antes deixam de ser encontradas e
+acabam por ser descartadas pela ordem LRU.
+"""
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+
+# Constantes importadas do config
+try:
+    from config import ROUTE_CACHE_MAX_ENTRIES, ROUTE_CACHE_MAX_PATH_NODES
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from config import ROUTE_CACHE_MAX_ENTRIES, ROUTE_CACHE_MAX_PATH_NODES
+
+Route = Tuple[float, float, List[int]]
+
+
+class RouteCache:
+    """
+    Cache LRU de rotas com limite de entradas e de nós guardados nos caminhos.
+
+    Attributes:
+        max_entries: Nº máximo de rotas (0 desativa a cache)
+        max_path_nodes: Nº máximo de nós somando todos os caminhos guardados
+        hits / misses: Consultas encontradas / não encontradas
+    """
+
+    def __init__(self, max_entries: int = ROUTE_CACHE_MAX_ENTRIES,
+                 max_path_nodes: int = ROUTE_CACHE_MAX_PATH_NODES) -> None:
+        self.max_entries = max_entries
+        self.max_path_nodes = max_path_nodes
+        self._routes: 'OrderedDict[Hashable, Route]' = OrderedDict()
+        self._path_nodes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def get(self, key: Hashable) -> Optional[Route]:
+        """
+        Procura uma rota e marca-a como usada recentemente.
+
+        Returns:
+            (distância, tempo, cópia do caminho), ou None se não existe
+        """
+        route = self._routes.get(key)
+        if route is None:
+            self.misses += 1
+            return None
+        self._routes.move_to_end(key)
+        self.hits += 1
+        distance, travel_time, path = route
+        return distance, travel_time, list(path)
+
+    def put(self, key: Hashable, route: Route) -> None:
+        """Guarda uma rota, descartando as menos usadas se ultrapassar os limites."""
+        if not self.enabled:
+            return
+        distance, travel_time, path = route
+        path = tuple(path)
+        old = self._routes.pop(key, None)
+        if old is not None:
+            self._path_nodes -= len(old[2])
+        self._routes[key] = (distance, travel_time, path)
+        self._path_nodes += len(path)
+        while self._routes and (len(self._routes) > self.max_entries
+                                or self._path_nodes > self.max_path_nodes):
+            _, evicted = self._routes.popitem(last=False)
+            self._path_nodes -= len(evicted[2])
+
+    def clear(self) -> None:
+        """Remove todas as rotas e repõe os contadores."""
+        self._routes.clear()
+        self._path_nodes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self) -> float:
+        """Fração das consultas encontradas na cache (0 se ainda não houve consultas)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
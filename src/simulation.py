@@ -4,13 +4,24 @@ Responsável pela lógica de negócio da simulação.
 """
 
 import time
+from bisect import insort
+from collections import Counter
 from refuel_helper import (
     needs_refuel, 
     get_refuel_time, 
     find_nearest_station, 
     get_station_type_for_vehicle,
 )
-from vehicle.vehicle_types import Eletric
+from vehicle.vehicle_types import Eletric, Hybrid
+from algorithms import get_algorithm_spec
+from algorithms.uninformed.one_to_many import many_to_one
+from algorithms.utils.cost_function import cost_profile_key
+from algorithms.utils.distance_matrix import distance_matrix
+from algorithms.utils.assignment import hungarian, INF
+from route_cache import RouteCache
+from dispatch_index import IdleVehicleIndex
+from utils.vehicle_costs import calculate_total_fuel_cost_consumed
+from config import DISPATCH_MODE, DISPATCH_CANDIDATES, BATCH_PREMIUM_WEIGHT, BATCH_UNASSIGNED_PENALTY
 
 class Simulation:
     """
@@ -18,19 +29,35 @@ class Simulation:
     Separada da visualização para melhor modularização.
     """
     
-    def __init__(self, database, search_algorithm, time_step=1, heuristic=None):
+    DISPATCH_MODES = ('per_vehicle', 'one_to_many', 'batch')
+
+    def __init__(self, database, search_algorithm, time_step=1, heuristic=None, dispatch_mode=DISPATCH_MODE):
         """
         Inicializa a simulação.
         
         Args:
             database: Database contendo veículos, grafo e requests
-            search_algorithm: Função de algoritmo de procura a usar
+            search_algorithm: Função de algoritmo de procura a usar (ou o seu
+                              SearchAlgorithm / nome em algorithms.ALGORITHMS)
             time_step: Quantos minutos avançam a cada tick (padrão: 1)
             heuristic: Heurística a usar (para algoritmos informados)
+            dispatch_mode: 'per_vehicle' (uma procura por veículo candidato),
+                           'one_to_many' (um Dijkstra invertido a partir do pickup
+                           avalia todos os candidatos de uma vez) ou 'batch'
+                           (todos os pedidos do tick atribuídos de uma vez com o
+                           algoritmo húngaro)
         """
+        if dispatch_mode not in self.DISPATCH_MODES:
+            raise ValueError(f"Modo de despacho desconhecido '{dispatch_mode}' (use um de {self.DISPATCH_MODES})")
         self.db = database
         self.search_algorithm_func = search_algorithm
         self.heuristic = heuristic
+        # Algoritmo com a heurística e o gestor de eventos já fixados (sem inspecionar a assinatura em cada procura)
+        self._search = self._bind_search()
+        self.dispatch_mode = dispatch_mode
+        self.tick_matrix = None  # Matriz veículos × pickups do tick atual (modo 'one_to_many')
+        self.matrix_workers = 1  # Processos para a matriz do tick (1 = no próprio processo; ver distance_matrix)
+        self.route_cache = RouteCache()  # Rotas já calculadas (ver route_cache)
         self.vehicles = database.vehicles
         self.requests = database.requests
         self.graph = database.graph
@@ -53,8 +80,11 @@ class Simulation:
             'requests_in_progress': 0
         }
         
-        # Estatísticas de tempo de procura do algoritmo
-        self.search_times = []  # Lista de tempos de cada procura (em ms)
+        # Contadores atualizados nas transições dos pedidos e no consumo dos veículos
+        self._init_incremental_stats()
+        
+        # Pedidos por ordem de chegada e fila dos que já chegaram e esperam veículo
+        self._init_request_queue()
         
         # Aplica eventos iniciais (clima/trânsito) no início da simulação
         if database.event_manager:
@@ -64,7 +94,8 @@ class Simulation:
         """
         Wrapper para chamar o algoritmo de busca com ou sem heurística.
         Agora normalizado: tanto A* como Greedy usam 'criterion'.
-        Mede o tempo de execução de cada procura.
+        Mede o tempo de execução de cada procura. Rotas repetidas no mesmo
+        epoch do grafo são servidas pela cache de rotas, sem nova procura.
         
         Args:
             start: Posição inicial
@@ -72,47 +103,87 @@ class Simulation:
             graph: Grafo
             vehicle: Veículo (opcional, para passar vehicle_type às heurísticas)
         """
-        import inspect
-        sig = inspect.signature(self.search_algorithm_func)
-        params = sig.parameters
+        # Prepara vehicle_type se disponível
+        vehicle_type = vehicle.vehicle_type if vehicle else None
+        
+        # Rota já calculada com os mesmos nós, parâmetros e epoch do grafo?
+        key = self._route_key(start, goal, graph, vehicle_type)
+        if key is not None:
+            cached = self.route_cache.get(key)
+            if cached is not None:
+                return cached
         
         # Mede tempo de execução
         start_time = time.perf_counter()
         
-        # Prepara vehicle_type se disponível
-        vehicle_type = vehicle.vehicle_type if vehicle else None
-        
-        # Verifica se o algoritmo aceita 'criterion' (algoritmos informados: A*, Greedy)
-        if 'criterion' in params and self.heuristic:
-            # Prepara argumentos opcionais
-            kwargs = {'criterion': self.heuristic}
-            
-            if 'vehicle_type' in params:
-                kwargs['vehicle_type'] = vehicle_type
-            
-            # Passa event_manager e current_time para heurísticas de tempo/trânsito
-            if 'event_manager' in params and hasattr(self.db, 'event_manager'):
-                kwargs['event_manager'] = self.db.event_manager
-            
-            if 'current_time' in params:
-                kwargs['current_time'] = self.current_time
-            
-            result = self.search_algorithm_func(start, goal, graph, **kwargs)
-        else:
-            # Algoritmos não informados (BFS, DFS, Uniform Cost)
-            # Uniform Cost também aceita vehicle_type para cálculo de custo
-            if 'vehicle_type' in params:
-                result = self.search_algorithm_func(start, goal, graph, vehicle_type=vehicle_type)
-            else:
-                result = self.search_algorithm_func(start, goal, graph)
+        result = self._search(start, goal, graph, vehicle_type, self.current_time)
         
         # Regista tempo de execução (em milissegundos)
         end_time = time.perf_counter()
         search_time_ms = (end_time - start_time) * 1000
-        self.search_times.append(search_time_ms)
+        self._record_search_time(search_time_ms)
+        
+        if key is not None:
+            self.route_cache.put(key, result)
         
         return result
     
+    def _bind_search(self):
+        """Fixa a heurística e o gestor de eventos no algoritmo de procura."""
+        return get_algorithm_spec(self.search_algorithm_func).bind(
+            self.heuristic, getattr(self.db, 'event_manager', None))
+    
+    def set_search_algorithm(self, search_algorithm, heuristic=None):
+        """
+        Muda o algoritmo de procura (e a heurística) a meio da simulação.
+        As rotas em cache continuam válidas: a chave inclui o algoritmo e a heurística.
+        
+        Args:
+            search_algorithm: Função de algoritmo de procura (ou SearchAlgorithm / nome)
+            heuristic: Heurística a usar (para algoritmos informados)
+        """
+        self.search_algorithm_func = search_algorithm
+        self.heuristic = heuristic
+        self._search = self._bind_search()
+    
+    def __getstate__(self):
+        # O algoritmo ligado (funções lambda) é recriado ao carregar (ver checkpoint)
+        state = self.__dict__.copy()
+        del state['_search']
+        state['tick_matrix'] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._search = self._bind_search()
+    
+    def _route_key(self, start, goal, graph, vehicle_type):
+        """
+        Chave da rota na cache: nós de origem e destino, algoritmo, critério,
+        perfil de custo do veículo e epoch do grafo. As heurísticas que
+        consultam o EventManager incluem também o instante atual.
+        
+        Returns:
+            Tuplo, ou None se a rota não deve usar a cache
+        """
+        if not self.route_cache.enabled or graph is not self.graph:
+            return None
+        start_node = graph.find_closest_node(start)
+        goal_node = graph.find_closest_node(goal)
+        if start_node is None or goal_node is None:
+            return None
+        
+        search = self._search
+        profile = None
+        if search.uses_vehicle_type:
+            profile = cost_profile_key(vehicle_type)
+            if isinstance(vehicle_type, Hybrid):
+                # Custos e heurísticas dos híbridos dependem da bateria atual
+                profile += (vehicle_type.current_battery,)
+        moment = self.current_time if search.time_dependent else None
+        
+        return (start_node.id, goal_node.id, search.algorithm.func, search.criterion, profile, graph.epoch, moment)
+    
     def reset(self):
         """Reset da simulação para estado inicial."""
         self.current_time = 8 * 60
@@ -125,31 +196,107 @@ class Simulation:
             'requests_not_served': 0,
             'requests_in_progress': 0
         }
-        self.search_times = []  # Reset tempos de procura
+        self._init_incremental_stats()
+        self._init_request_queue()
+        self.tick_matrix = None
+        self.route_cache.clear()
+    
+    def _init_incremental_stats(self):
+        """
+        Prepara os contadores incrementais: nº de pedidos por estado, custo de
+        combustível por veículo e agregados dos tempos de procura. Os pedidos e
+        os veículos avisam a simulação em cada transição/consumo, pelo que
+        update_statistics não percorre pedidos, veículos nem tempos de procura.
+        """
+        self.request_counts = Counter(r.status for r in self.requests)
+        for request in self.requests:
+            request.status_listener = self._on_request_status
+        
+        # Veículos livres por célula e classe, atualizado nas transições de estado
+        self.idle_index = IdleVehicleIndex(self.vehicles, self.graph.spatial_index().cell_size)
+        for vehicle in self.vehicles:
+            vehicle.status_listener = self.idle_index.on_status_change
+        
+        self._vehicle_fuel_cost = {}
+        self._total_fuel_cost = 0.0
+        for vehicle in self.vehicles:
+            vehicle.energy_listener = self._on_vehicle_energy
+            cost = calculate_total_fuel_cost_consumed(vehicle.vehicle_type)
+            self._vehicle_fuel_cost[vehicle] = cost
+            self._total_fuel_cost += cost
+        
+        # Estatísticas de tempo de procura do algoritmo (em ms)
+        self.search_count = 0
+        self.search_time_total_ms = 0
+        self.search_time_min_ms = float('inf')
+        self.search_time_max_ms = 0
+    
+    def _on_request_status(self, request, old_status, new_status):
+        """Atualiza os contadores de pedidos numa transição de estado."""
+        self.request_counts[old_status] -= 1
+        self.request_counts[new_status] += 1
+    
+    def _on_vehicle_energy(self, vehicle):
+        """Atualiza o custo total de combustível quando a energia de um veículo muda."""
+        cost = calculate_total_fuel_cost_consumed(vehicle.vehicle_type)
+        self._total_fuel_cost += cost - self._vehicle_fuel_cost[vehicle]
+        self._vehicle_fuel_cost[vehicle] = cost
+    
+    def _record_search_time(self, search_time_ms):
+        """Regista o tempo de uma procura nos agregados."""
+        self.search_count += 1
+        self.search_time_total_ms += search_time_ms
+        self.search_time_min_ms = min(self.search_time_min_ms, search_time_ms)
+        self.search_time_max_ms = max(self.search_time_max_ms, search_time_ms)
+    
+    def _init_request_queue(self):
+        """
+        Prepara a entrada de pedidos: os pedidos pendentes ordenados por hora
+        de pedido, com um cursor que os liberta à medida que o relógio passa
+        por eles, e a fila de espera (lista ordenada por prioridade) com os
+        que já chegaram mas ainda não têm veículo.
+        """
+        self._arrivals = sorted(
+            ((index, r) for index, r in enumerate(self.requests) if r.status == 'pending'),
+            key=lambda entry: entry[1].requested_time
+        )
+        self._arrival_cursor = 0
+        self._pending_queue = []  # (not premium, requested_time, índice, request)
+    
+    def _release_arrived_requests(self):
+        """Passa para a fila de espera os pedidos com requested_time <= tempo atual."""
+        arrivals = self._arrivals
+        cursor = self._arrival_cursor
+        while cursor < len(arrivals) and arrivals[cursor][1].requested_time <= self.current_time:
+            index, request = arrivals[cursor]
+            insort(self._pending_queue, (not request.premium, request.requested_time, index, request))
+            cursor += 1
+        self._arrival_cursor = cursor
     
     def is_finished(self):
         """Verifica se a simulação terminou."""
         return self.current_time >= self.end_time
     
     
-    def get_available_vehicles_for_request(self, request):
+    def get_available_vehicles_for_request(self, request, limit=None):
         """
         Retorna lista de veículos disponíveis e compatíveis com o request.
         Se o cliente preferir eco-friendly, apenas veículos elétricos são considerados.
+        Veículos sem capacidade para os passageiros ficam de fora.
         
         Args:
             request: Request a ser verificado
+            limit: Nº máximo de veículos, os mais próximos do pickup (None = todos)
             
         Returns:
-            Lista de veículos disponíveis e compatíveis
+            Lista de veículos disponíveis e compatíveis (pela ordem da frota)
         """
-        available = [v for v in self.vehicles if v.status.name == 'IDLE']
-        # Filtra por preferência ambiental
-        if request.eco_friendly:
-            # Apenas veículos elétricos
-            available = [v for v in available if isinstance(v.vehicle_type, Eletric)]
-            
-        return available
+        return self.idle_index.candidates(
+            request.start_point.x, request.start_point.y,
+            electric_only=request.eco_friendly,
+            min_capacity=getattr(request, 'passengers', 0),
+            limit=limit
+        )
 
 
     
@@ -165,27 +312,95 @@ class Simulation:
         Returns:
             Vehicle atribuído ou None se não houver disponível
         """
-        available_vehicles = self.get_available_vehicles_for_request(request)
+        # Só os candidatos mais próximos do pickup são avaliados com rotas;
+        # se nenhum servir, a procura alarga-se aos seguintes
+        limit = DISPATCH_CANDIDATES or None
+        while True:
+            available_vehicles = self.get_available_vehicles_for_request(request, limit)
+            
+            if not available_vehicles:
+                # Não há veículos disponíveis (eco_friendly ou não)
+                return None
+            
+            if self.dispatch_mode == 'one_to_many':
+                best = self._select_vehicle_one_to_many(request, available_vehicles)
+            else:
+                best = None
+                for vehicle in available_vehicles:
+                    candidate = self._evaluate_vehicle(vehicle, request)
+                    if candidate is not None and candidate[1] < (best[1] if best else float('inf')):
+                        best = candidate
+            
+            if best is not None or limit is None or len(available_vehicles) < limit:
+                break
+            limit *= 2
         
-        if not available_vehicles:
-            # Não há veículos disponíveis (eco_friendly ou não)
+        if best is None:
             return None
         
-        best_vehicle = None
-        best_cost = float('inf')
-        best_paths = None
-        best_refuel_info = None
-        best_real_distance = 0.0  # Inicializa para evitar erro se nenhum veículo for compatível
-        station_type = None  # Inicializa para evitar NameError
+        return self._apply_assignment(request, best)
+    
+    def _apply_assignment(self, request, best):
+        """
+        Atribui o request ao veículo avaliado (caminhos e abastecimento incluídos).
         
-        for vehicle in available_vehicles:
-            # Verifica se o veículo tem capacidade suficiente para o pedido
-            if hasattr(request, 'passengers') and vehicle.capacity < request.passengers:
-                continue
+        Args:
+            request: Request a atribuir
+            best: Tuplo de _evaluate_vehicle do veículo escolhido
+            
+        Returns:
+            Vehicle atribuído
+        """
+        best_vehicle, _, best_paths, best_refuel_info, best_real_distance = best
+        time_to_pickup, trip_time, path_to_pickup, path_to_dest = best_paths
+        refuel_needed, refuel_station, refuel_path, refuel_time, station_type = best_refuel_info
+        
+        # Se precisa abastecer, adiciona informação ao veículo
+        if refuel_needed and refuel_station and refuel_path:
+            
+            # Passa informação de abastecimento (incluindo tipo de estação)
+            refuel_info = (refuel_path, refuel_station.id, refuel_time, station_type)
+        else:
+            refuel_info = None
+        
+        best_vehicle.assign(
+            request, 
+            path_to_pickup, 
+            path_to_dest, 
+            self.graph,
+            refuel_info=refuel_info
+        )
+        
+        self.stats['total_distance'] += best_real_distance
+        self.stats['total_time'] += time_to_pickup + trip_time
+        
+        return best_vehicle
+    
+    def _evaluate_vehicle(self, vehicle, request, leg1=None, leg2=None):
+        """
+        Calcula o custo (tempo total) de atribuir o request a um veículo.
+        
+        Args:
+            vehicle: Veículo candidato
+            request: Request a atribuir
+            leg1: (distância, tempo, caminho) veículo → pickup já conhecido (opcional)
+            leg2: (distância, tempo, caminho) pickup → destino já conhecido (opcional)
+            
+        Returns:
+            Tuple (vehicle, custo em minutos, (time1, time2, path1, path2),
+            (refuel_needed, estação, caminho até à estação, tempo de abastecimento, tipo de estação),
+            distância real), ou None se o veículo não serve o pedido
+        """
+        # Verifica se o veículo tem capacidade suficiente para o pedido
+        if hasattr(request, 'passengers') and vehicle.capacity < request.passengers:
+            return None
 
-            # Caminho: veículo → pickup
-            # IMPORTANTE: Os algoritmos retornam (distância_metros, tempo_minutos, path)
-            # Usamos TEMPO como critério de escolha do melhor veículo
+        # Caminho: veículo → pickup
+        # IMPORTANTE: Os algoritmos retornam (distância_metros, tempo_minutos, path)
+        # Usamos TEMPO como critério de escolha do melhor veículo
+        if leg1 is not None:
+            dist1, time1, path1 = leg1
+        else:
             dist1, time1, path1 = self.search_algorithm(
                 vehicle.current_position, 
                 request.start_point, 
@@ -193,7 +408,10 @@ class Simulation:
                 vehicle=vehicle
             )
 
-            # Caminho: pickup → destino
+        # Caminho: pickup → destino
+        if leg2 is not None:
+            dist2, time2, path2 = leg2
+        else:
             dist2, time2, path2 = self.search_algorithm(
                 request.start_point, 
                 request.end_point, 
@@ -201,150 +419,252 @@ class Simulation:
                 vehicle=vehicle
             )
 
-            total_distance = dist1 + dist2
+        total_distance = dist1 + dist2
 
-            # Verifica se precisa abastecer
-            refuel_needed = needs_refuel(vehicle, total_distance)
-            refuel_time = 0
-            refuel_station = None
-            refuel_path = None
+        # Verifica se precisa abastecer
+        refuel_needed = needs_refuel(vehicle, total_distance)
+        refuel_time = 0
+        refuel_station = None
+        refuel_path = None
+        station_type = None
 
-            if refuel_needed:
-                # Encontra estação mais próxima
-                station_type = get_station_type_for_vehicle(vehicle)
-                refuel_station = find_nearest_station(
-                    self.graph, 
-                    vehicle.current_position, 
-                    station_type
-                )
-
-                if refuel_station:
-                    # Calcula caminho até a estação
-                    station_dist, station_time, station_path = self.search_algorithm(
-                        vehicle.current_position,
-                        refuel_station.position,
-                        self.graph,
-                        vehicle=vehicle
-                    )
-
-                    # Recalcula caminho da estação até o pickup
-                    dist1_new, time1_new, path1_new = self.search_algorithm(
-                        refuel_station.position,
-                        request.start_point,
-                        self.graph,
-                        vehicle=vehicle
-                    )
+        if refuel_needed:
+            # Encontra estação mais próxima
+            station_type = get_station_type_for_vehicle(vehicle)
+            refuel_station = find_nearest_station(
+                self.graph, 
+                vehicle.current_position, 
+                station_type
+            )
 
-                    # Tempo total de abastecimento (baseado no tipo de estação)
-                    refuel_time = get_refuel_time(vehicle, station_type)
+            if refuel_station:
+                # Calcula caminho até a estação
+                station_dist, station_time, station_path = self.search_algorithm(
+                    vehicle.current_position,
+                    refuel_station.position,
+                    self.graph,
+                    vehicle=vehicle
+                )
 
-                    # Ajusta tempo total (critério de otimização é TEMPO)
-                    time1 = station_time + refuel_time + time1_new
+                # Recalcula caminho da estação até o pickup
+                dist1_new, time1_new, path1_new = self.search_algorithm(
+                    refuel_station.position,
+                    request.start_point,
+                    self.graph,
+                    vehicle=vehicle
+                )
 
-                    # Atualiza caminhos
-                    refuel_path = station_path
-                    path1 = path1_new
-                    
-                    # IMPORTANTE: Recalcula distância REAL com o novo caminho
-                    total_distance = station_dist + dist1_new + dist2
+                # Tempo total de abastecimento (baseado no tipo de estação)
+                refuel_time = get_refuel_time(vehicle, station_type)
 
-            total_time_cost = time1 + time2
+                # Ajusta tempo total (critério de otimização é TEMPO)
+                time1 = station_time + refuel_time + time1_new
 
-            if total_time_cost < best_cost:
-                best_cost = total_time_cost
-                best_vehicle = vehicle
-                best_paths = (time1, time2, path1, path2)
-                best_refuel_info = (refuel_needed, refuel_station, refuel_path, refuel_time, station_type if refuel_needed else None)
-                best_real_distance = total_distance  # Guarda a distância REAL do melhor caminho
-        
-        if best_vehicle and best_paths:
-            time_to_pickup, trip_time, path_to_pickup, path_to_dest = best_paths
-            refuel_needed, refuel_station, refuel_path, refuel_time, station_type = best_refuel_info
-            
-            # Se precisa abastecer, adiciona informação ao veículo
-            if refuel_needed and refuel_station and refuel_path:
+                # Atualiza caminhos
+                refuel_path = station_path
+                path1 = path1_new
                 
-                # Passa informação de abastecimento (incluindo tipo de estação)
-                refuel_info = (refuel_path, refuel_station.id, refuel_time, station_type)
-            else:
-                refuel_info = None
+                # IMPORTANTE: Recalcula distância REAL com o novo caminho
+                total_distance = station_dist + dist1_new + dist2
+
+        total_time_cost = time1 + time2
+        refuel_info = (refuel_needed, refuel_station, refuel_path, refuel_time, station_type)
+        return vehicle, total_time_cost, (time1, time2, path1, path2), refuel_info, total_distance
+    
+    def _select_vehicle_one_to_many(self, request, available_vehicles):
+        """
+        Escolhe o veículo com um único Dijkstra invertido (métrica tempo) a
+        partir do pickup, em vez de uma procura por veículo. Se a matriz do
+        tick atual (build_tick_matrix) já cobre o pickup e os candidatos, usa-a
+        sem procurar de novo.
+        O caminho até ao pickup só é extraído para o vencedor, que é depois
+        reavaliado com o seu tipo de veículo (trajeto até ao destino e
+        abastecimento).
+        
+        Args:
+            request: Request a atribuir
+            available_vehicles: Veículos disponíveis e compatíveis
             
-            best_vehicle.assign(
-                request, 
-                path_to_pickup, 
-                path_to_dest, 
-                self.graph,
-                refuel_info=refuel_info
-            )
+        Returns:
+            Tuplo de _evaluate_vehicle para o melhor veículo, ou None
+        """
+        pickup_id = self.graph.find_closest_node(request.start_point).id
+        vehicle_nodes = {
+            vehicle: self.graph.find_closest_node(vehicle.current_position).id
+            for vehicle in available_vehicles
+        }
+        
+        matrix = self.tick_matrix
+        if matrix is not None and all((node_id, pickup_id) in matrix for node_id in vehicle_nodes.values()):
+            def leg_metrics(node_id):
+                distance, travel_time, _ = matrix.lookup(node_id, pickup_id)
+                return distance, travel_time
+            leg_path = lambda node_id: matrix.path(node_id, pickup_id)
+        else:
+            start_time = time.perf_counter()
+            tree = many_to_one(pickup_id, self.graph, sources=set(vehicle_nodes.values()), metric='time')
+            self._record_search_time((time.perf_counter() - start_time) * 1000)
+            leg_metrics = tree.metrics
+            leg_path = tree.path
+        
+        # Trajeto pickup → destino comum a todos os candidatos (só para os comparar)
+        trip = self.search_algorithm(request.start_point, request.end_point, self.graph)
+        
+        best = None
+        for vehicle, node_id in vehicle_nodes.items():
+            dist1, time1 = leg_metrics(node_id)
+            if time1 == float('inf'):
+                continue
+            candidate = self._evaluate_vehicle(vehicle, request, leg1=(dist1, time1, None), leg2=trip)
+            if candidate is not None and candidate[1] < (best[1] if best else float('inf')):
+                best = candidate
+        
+        if best is None:
+            return None
+        
+        vehicle = best[0]
+        node_id = vehicle_nodes[vehicle]
+        dist1, time1 = leg_metrics(node_id)
+        return self._evaluate_vehicle(vehicle, request, leg1=(dist1, time1, leg_path(node_id)))
+    
+    def build_tick_matrix(self, requests):
+        """
+        Calcula a matriz de tempos (veículos livres × pickups) para os pedidos
+        do tick atual, com uma procura por pickup em vez de uma por par.
+        
+        Args:
+            requests: Pedidos pendentes
             
-            self.stats['total_distance'] += best_real_distance
-            self.stats['total_time'] += time_to_pickup + trip_time
+        Returns:
+            DistanceMatrix (com caminhos), ou None se não há veículos livres ou pedidos
+        """
+        vehicle_nodes = [
+            self.graph.find_closest_node(v.current_position).id
+            for v in self.vehicles if v.status.name == 'IDLE'
+        ]
+        pickup_nodes = [self.graph.find_closest_node(r.start_point).id for r in requests]
+        if not vehicle_nodes or not pickup_nodes:
+            return None
         
-        return best_vehicle
+        start_time = time.perf_counter()
+        matrix = distance_matrix(vehicle_nodes, pickup_nodes, self.graph, metric='time', keep_paths=True,
+                                 workers=self.matrix_workers)
+        self._record_search_time((time.perf_counter() - start_time) * 1000)
+        return matrix
     
     def process_new_requests(self):
         """
         Processa requests que chegam no tempo atual e ainda não foram atribuídos.
         PRIORIDADE: Clientes premium são processados primeiro.
         """
-        new_requests = [
-            r for r in self.requests 
-            if r.requested_time <= self.current_time and r.status == 'pending'  # Apenas não atribuídos
-        ]
-        
-        # Ordena por prioridade: premium primeiro (True > False), depois por tempo de pedido
-        new_requests.sort(key=lambda r: (not r.premium, r.requested_time))
+        # Fila já ordenada por prioridade: premium primeiro (True > False), depois por tempo de pedido
+        self._release_arrived_requests()
+        new_requests = [entry[-1] for entry in self._pending_queue]
+        pending_before = self.request_counts['pending']
+        
+        # Matriz veículos × pickups calculada uma vez por tick
+        self.tick_matrix = None
+        if self.dispatch_mode == 'one_to_many' and new_requests:
+            self.tick_matrix = self.build_tick_matrix(new_requests)
+        
+        if self.dispatch_mode == 'batch':
+            self.assign_requests_batch(new_requests)
+        else:
+            for request in new_requests:
+                vehicle = self.assign_request_to_vehicle(request)
         
-        for request in new_requests:
-            vehicle = self.assign_request_to_vehicle(request)
+        # Os pedidos sem veículo continuam na fila, pela mesma ordem
+        if self.request_counts['pending'] != pending_before:
+            self._pending_queue = [entry for entry in self._pending_queue if entry[-1].status == 'pending']
         return len(new_requests)
     
+    def assign_requests_batch(self, requests):
+        """
+        Atribui todos os requests pendentes de uma vez (modo 'batch').
+        
+        Constrói a matriz de custos requests × veículos livres (tempo total de
+        _evaluate_vehicle, só para os DISPATCH_CANDIDATES mais próximos de cada
+        pickup) e resolve-a com o algoritmo húngaro. Cada request tem também
+        colunas "sem veículo" com custo BATCH_UNASSIGNED_PENALTY, pelo que só
+        fica por atribuir quando não há veículos para todos. Os custos dos
+        pedidos premium são multiplicados por BATCH_PREMIUM_WEIGHT: com
+        veículos a menos são os primeiros a ser servidos.
+        
+        Args:
+            requests: Requests pendentes, por ordem de prioridade
+            
+        Returns:
+            Número de requests atribuídos
+        """
+        candidates = [
+            self.get_available_vehicles_for_request(request, DISPATCH_CANDIDATES or None)
+            for request in requests
+        ]
+        vehicles = sorted({v for vehicle_list in candidates for v in vehicle_list},
+                          key=self.idle_index.fleet_index.__getitem__)
+        if not vehicles:
+            return 0
+        column = {vehicle: j for j, vehicle in enumerate(vehicles)}
+        
+        cost_matrix = []
+        evaluations = {}
+        for i, request in enumerate(requests):
+            weight = BATCH_PREMIUM_WEIGHT if request.premium else 1.0
+            row = [INF] * len(vehicles) + [weight * BATCH_UNASSIGNED_PENALTY] * len(requests)
+            for vehicle in candidates[i]:
+                candidate = self._evaluate_vehicle(vehicle, request)
+                if candidate is not None and candidate[1] < INF:
+                    row[column[vehicle]] = weight * candidate[1]
+                    evaluations[i, column[vehicle]] = candidate
+            cost_matrix.append(row)
+        
+        assigned = 0
+        for i, j in enumerate(hungarian(cost_matrix)):
+            if j < len(vehicles):
+                self._apply_assignment(requests[i], evaluations[i, j])
+                assigned += 1
+        return assigned
+    
     def update_vehicles(self):
         """Atualiza estado de todos os veículos."""
         for vehicle in self.vehicles:
             vehicle.update_status(self.current_time, self.time_step)
     
     def update_statistics(self):
-        """Atualiza estatísticas da simulação."""
-        self.stats['requests_completed'] = sum(
-            1 for r in self.requests if r.status == 'completed'
-        )
+        """Atualiza estatísticas da simulação (O(1): usa os contadores incrementais)."""
+        counts = self.request_counts
+        self.stats['requests_completed'] = counts['completed']
         # Pendentes = não atribuídos (status 'pending')
         # 'assigned' e 'picked_up' não contam como pendentes
-        self.stats['requests_pending'] = sum(
-            1 for r in self.requests if r.status == 'pending'
-        )
+        self.stats['requests_pending'] = counts['pending']
         # Opcional: adicionar estatística de requests em andamento
-        self.stats['requests_in_progress'] = sum(
-            1 for r in self.requests if r.status in ['assigned', 'picked_up']
-        )
+        self.stats['requests_in_progress'] = counts['assigned'] + counts['picked_up']
         
-        # Calcula custo total de combustível usando função centralizada
-        from utils.vehicle_costs import calculate_total_fuel_cost_consumed
-        
-        total_fuel_cost = 0.0
-        for vehicle in self.vehicles:
-            total_fuel_cost += calculate_total_fuel_cost_consumed(vehicle.vehicle_type)
-        
-        self.stats['total_fuel_cost'] = total_fuel_cost
+        # Custo total de combustível (soma de calculate_total_fuel_cost_consumed por veículo)
+        self.stats['total_fuel_cost'] = self._total_fuel_cost
         
         # Requests não atendidos (finalizou simulação com status 'pending')
         if self.is_finished():
             self.stats['requests_not_served'] = self.stats['requests_pending']
         
         # Estatísticas de tempo de procura do algoritmo
-        if self.search_times:
-            self.stats['search_count'] = len(self.search_times)
-            self.stats['search_time_total_ms'] = sum(self.search_times)
-            self.stats['search_time_avg_ms'] = sum(self.search_times) / len(self.search_times)
-            self.stats['search_time_min_ms'] = min(self.search_times)
-            self.stats['search_time_max_ms'] = max(self.search_times)
+        if self.search_count:
+            self.stats['search_count'] = self.search_count
+            self.stats['search_time_total_ms'] = self.search_time_total_ms
+            self.stats['search_time_avg_ms'] = self.search_time_total_ms / self.search_count
+            self.stats['search_time_min_ms'] = self.search_time_min_ms
+            self.stats['search_time_max_ms'] = self.search_time_max_ms
         else:
             self.stats['search_count'] = 0
             self.stats['search_time_total_ms'] = 0
             self.stats['search_time_avg_ms'] = 0
             self.stats['search_time_min_ms'] = 0
             self.stats['search_time_max_ms'] = 0
+        
+        # Cache de rotas
+        self.stats['route_cache_hits'] = self.route_cache.hits
+        self.stats['route_cache_misses'] = self.route_cache.misses
+        self.stats['route_cache_hit_rate'] = self.route_cache.hit_rate()
     
     def step(self):
         """
@@ -43,7 +43,8 @@ class Vehicle:
         self.vehicle_type: VehicleType = vehicle_type
         self.capacity: int = capacity
         self.driver: str = driver
-        self.status: Vehicle_Status = status
+        self._status: Vehicle_Status = status
+        self.status_listener = None  # Chamado com (veículo, estado antigo, estado novo) em cada transição
 
         # ===== Posição e navegação =====
         self.current_position: Position = start_point
@@ -75,6 +76,18 @@ class Vehicle:
         # ===== Impacto Ambiental =====
         self.total_emissions: float = 0.0  # Total de CO₂ emitido em gramas
         self.total_distance_traveled: float = 0.0  # Distância total percorrida em metros
+        self.energy_listener = None  # Chamado com (veículo) quando a bateria/combustível muda
+
+    @property
+    def status(self) -> Vehicle_Status:
+        return self._status
+
+    @status.setter
+    def status(self, new_status: Vehicle_Status) -> None:
+        old_status = self._status
+        self._status = new_status
+        if self.status_listener is not None and new_status != old_status:
+            self.status_listener(self, old_status, new_status)
 
     # ========================================
     # ATRIBUIÇÃO DE PEDIDOS
@@ -161,13 +174,9 @@ class Vehicle:
         self.current_edge_from = self.path[0]
         self.current_edge_to = self.path[1]
         
-        # Busca tempo da aresta no grafo
-        edges: List[Dict[str, Any]] = self.graph.edges.get(self.current_edge_from, [])
-        edge_time: float = 0.0
-        for edge in edges:
-            if edge["target"] == self.current_edge_to:
-                edge_time = edge["time"]
-                break
+        # Busca tempo da aresta no grafo (índice O(1) por par de nós)
+        edge: Optional[Dict[str, Any]] = self.graph.get_edge(self.current_edge_from, self.current_edge_to)
+        edge_time: float = edge["time"] if edge is not None else 0.0
         
         self.edge_travel_time = edge_time
         self.time_remaining_on_edge = edge_time
@@ -272,6 +281,8 @@ class Vehicle:
                 self.vehicle_type.current_fuel = self.vehicle_type.fuel_capacity
             elif self.refuel_station_type == "charging":
                 self.vehicle_type.current_battery = self.vehicle_type.battery_capacity
+        if self.energy_listener is not None:
+            self.energy_listener(self)
 
     def _process_travel(self, time_step: int) -> None:
         """Processa o movimento do veículo durante a viagem."""
@@ -340,6 +351,8 @@ class Vehicle:
             
             # Consome energia primeiro
             self.vehicle_type.consume(distance)
+            if self.energy_listener is not None:
+                self.energy_listener(self)
             
             # Calcula emissões DEPOIS de consumir
             # Para híbridos, usa o estado anterior da bateria